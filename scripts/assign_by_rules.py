@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Script to assign GitHub issues to milestones using label and title rules.
+Usage: python scripts/assign_by_rules.py <github_token> [--plan] [--graphql]
+
+Rules are defined in RULES below (see assignment_rules.py for the format).
+Issues are streamed page by page and matched in a single pass.
+"""
+
+import sys
+import github_api
+import github_graphql
+
+from assignment_rules import compile_rules
+
+# Assignment rules, first match wins
+RULES = [
+    {"milestone": "Landing Page v1", "labels": ["landing-page", "high-priority"]},
+    {"milestone": "MVP Release", "labels": ["landing-page", "medium-priority"]},
+    {"milestone": "Landing Page v1", "title_prefix": "[Landing Page]", "current_milestone": None},
+    {"milestone": "Activities Page v1", "labels": ["activities-page"]},
+    {"milestone": "Activities Detail Page v1", "labels": ["detail-page"]},
+    {"milestone": "Booking Flow v1", "keywords": ["booking", "checkout"], "current_milestone": None},
+]
+
+def get_milestones(token, repo_owner, repo_name):
+    """Get all open milestones for a repository."""
+    if github_api.USE_GRAPHQL:
+        milestones = github_graphql.get_milestones(token, repo_owner, repo_name) or []
+        return {milestone["title"]: milestone["number"] for milestone in milestones}
+
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/milestones?state=open&per_page=100"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+
+    response = github_api.get(url, headers=headers)
+
+    if response.status_code == 200:
+        return {milestone["title"]: milestone["number"] for milestone in github_api.decode(response)}
+    else:
+        print(f"❌ Failed to get milestones")
+        print(f"Error: {response.text}")
+        return {}
+
+def iter_issues(token, repo_owner, repo_name, state="open"):
+    """Yield issues one page at a time, following the Link header."""
+    if github_api.USE_GRAPHQL:
+        try:
+            yield from github_graphql.iter_issues(token, repo_owner, repo_name, state)
+        except RuntimeError:
+            print(f"❌ Failed to get issues")
+        return
+
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+    params = {
+        "state": state,
+        "per_page": 100
+    }
+
+    while url:
+        response = github_api.get(url, headers=headers, params=params)
+
+        if response.status_code != 200:
+            print(f"❌ Failed to get issues")
+            print(f"Error: {response.text}")
+            return
+
+        for issue in github_api.decode(response):
+            # Filter out pull requests
+            if "pull_request" not in issue:
+                yield issue
+
+        url = response.links.get("next", {}).get("url")
+        params = None  # The next link already carries the query string
+
+def assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milestone_number):
+    """Assign an issue to a milestone."""
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues/{issue_number}"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+    data = {
+        "milestone": milestone_number
+    }
+
+    response = github_api.patch(url, headers=headers, json=data)
+
+    if response.status_code == 200:
+        return True
+    else:
+        print(f"❌ Failed to assign issue #{issue_number} to milestone #{milestone_number}")
+        print(f"Error: {response.text}")
+        return False
+
+def main():
+    github_api.configure_from_argv()
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/assign_by_rules.py <github_token> [--plan] [--graphql]")
+        sys.exit(1)
+
+    token = sys.argv[1]
+    repo_owner = "samsiso"
+    repo_name = "mallocra-activities"
+
+    milestones = get_milestones(token, repo_owner, repo_name)
+    if not milestones:
+        print("No milestones found. Please create milestones first.")
+        sys.exit(1)
+
+    missing = {rule["milestone"] for rule in RULES if rule["milestone"] not in milestones}
+    for title in sorted(missing):
+        print(f"Milestone '{title}' not found. Rules targeting it will be skipped.")
+
+    matcher = compile_rules(RULES)
+    print(f"Compiled {len(RULES)} rules. Matching open issues...")
+
+    moves = []
+    with github_api.phase("plan"):
+        for issue, rule in matcher.match_all(iter_issues(token, repo_owner, repo_name)):
+            milestone_title = rule["milestone"]
+            current = issue["milestone"]["title"] if issue.get("milestone") else None
+            if milestone_title in missing or current == milestone_title:
+                continue
+            moves.append((issue, milestone_title))
+
+    def assign(move):
+        issue, milestone_title = move
+        print(f"  - Assigning issue #{issue['number']} ({issue['title']}) to milestone '{milestone_title}'")
+        return assign_issue_to_milestone(token, repo_owner, repo_name, issue["number"], milestones[milestone_title])
+
+    results = github_api.run_concurrently(assign, moves)
+    print(f"\nDone! Assigned {sum(results)} of {len(moves)} matching issues "
+          f"(write concurrency {github_api.concurrency_label()}).")
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,30 @@
 #!/usr/bin/env python3
 """
 Interactive script to assign GitHub issues to milestones.
-Usage: python scripts/assign_issues_interactive.py
+Usage: python scripts/assign_issues_interactive.py [--plan] [--graphql]
 """
 
 import sys
-import requests
+import github_api
+import github_graphql
 import json
 import getpass
 
 def get_milestones(token, repo_owner, repo_name):
     """Get all milestones from a repository."""
+    if github_api.USE_GRAPHQL:
+        return github_graphql.get_milestones(token, repo_owner, repo_name) or []
+
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/milestones"
     headers = {
         "Accept": "application/vnd.github.v3+json",
         "Authorization": f"token {token}"
     }
     
-    response = requests.get(url, headers=headers)
+    response = github_api.get(url, headers=headers)
     
     if response.status_code == 200:
-        return response.json()
+        return github_api.decode(response)
     else:
         print(f"❌ Failed to get milestones.")
         print(f"Error: {response.text}")
@@ -28,6 +32,9 @@ def get_milestones(token, repo_owner, repo_name):
 
 def get_issues(token, repo_owner, repo_name):
     """Get all issues from a repository."""
+    if github_api.USE_GRAPHQL:
+        return github_graphql.get_issues(token, repo_owner, repo_name)
+
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues"
     headers = {
         "Accept": "application/vnd.github.v3+json",
@@ -40,11 +47,11 @@ def get_issues(token, repo_owner, repo_name):
         "per_page": 100
     }
     
-    response = requests.get(url, headers=headers, params=params)
+    response = github_api.get(url, headers=headers, params=params)
     
     if response.status_code == 200:
         # Filter out pull requests (they're also returned by the issues endpoint)
-        return [issue for issue in response.json() if "pull_request" not in issue]
+        return [issue for issue in github_api.decode(response) if "pull_request" not in issue]
     else:
         print(f"❌ Failed to get issues.")
         print(f"Error: {response.text}")
@@ -62,7 +69,7 @@ def assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milest
         "milestone": milestone_number
     }
     
-    response = requests.patch(url, headers=headers, json=data)
+    response = github_api.patch(url, headers=headers, json=data)
     
     if response.status_code == 200:
         return True
@@ -72,6 +79,7 @@ def assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milest
         return False
 
 def main():
+    github_api.configure_from_argv()
     repo_owner = input("Enter GitHub repository owner (default: samsiso): ") or "samsiso"
     repo_name = input("Enter GitHub repository name (default: mallocra-activities): ") or "mallocra-activities"
     
@@ -112,7 +120,8 @@ def main():
         sys.exit(1)
     
     # Filter issues that don't have the selected milestone
-    unassigned_issues = [issue for issue in issues if not issue.get("milestone") or issue["milestone"]["number"] != selected_milestone["number"]]
+    with github_api.phase("plan"):
+        unassigned_issues = [issue for issue in issues if not issue.get("milestone") or issue["milestone"]["number"] != selected_milestone["number"]]
     
     if not unassigned_issues:
         print(f"All open issues are already assigned to milestone '{selected_milestone['title']}'.")
@@ -130,26 +139,28 @@ def main():
     
     choice = input("\nEnter your choice: ").lower()
     
+    def assign(issue):
+        print(f"Assigning issue #{issue['number']} to milestone '{selected_milestone['title']}'...")
+        if assign_issue_to_milestone(token, repo_owner, repo_name, issue["number"], selected_milestone["number"]):
+            print(f"✅ Successfully assigned issue #{issue['number']} to milestone '{selected_milestone['title']}'")
+    
     if choice == 'a':
         # Assign all unassigned issues
-        for issue in unassigned_issues:
-            print(f"Assigning issue #{issue['number']} to milestone '{selected_milestone['title']}'...")
-            if assign_issue_to_milestone(token, repo_owner, repo_name, issue["number"], selected_milestone["number"]):
-                print(f"✅ Successfully assigned issue #{issue['number']} to milestone '{selected_milestone['title']}'")
+        github_api.run_concurrently(assign, unassigned_issues)
+        print(f"Write concurrency: {github_api.concurrency_label()}")
     
     elif choice == 's':
         # Assign selected issues
         selections = input("Enter the numbers of the issues to assign (comma-separated): ")
         try:
             indices = [int(x.strip()) - 1 for x in selections.split(',')]
+            selected = []
             for idx in indices:
                 if 0 <= idx < len(unassigned_issues):
-                    issue = unassigned_issues[idx]
-                    print(f"Assigning issue #{issue['number']} to milestone '{selected_milestone['title']}'...")
-                    if assign_issue_to_milestone(token, repo_owner, repo_name, issue["number"], selected_milestone["number"]):
-                        print(f"✅ Successfully assigned issue #{issue['number']} to milestone '{selected_milestone['title']}'")
+                    selected.append(unassigned_issues[idx])
                 else:
                     print(f"Invalid selection: {idx + 1}")
+            github_api.run_concurrently(assign, selected)
         except ValueError:
             print("Invalid input. Please enter comma-separated numbers.")
     
@@ -1,25 +1,30 @@
 #!/usr/bin/env python3
 """
 Script to assign GitHub issues to milestones.
-Usage: python scripts/assign_issues_to_milestones.py <github_token>
+Usage: python scripts/assign_issues_to_milestones.py <github_token> [--plan] [--graphql]
 """
 
 import sys
-import requests
+import github_api
+import github_graphql
 import json
 
 def get_milestones(token, repo_owner, repo_name):
     """Get all milestones for a repository."""
+    if github_api.USE_GRAPHQL:
+        milestones = github_graphql.get_milestones(token, repo_owner, repo_name) or []
+        return {milestone["title"]: milestone["number"] for milestone in milestones}
+
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/milestones?state=open"
     headers = {
         "Accept": "application/vnd.github.v3+json",
         "Authorization": f"token {token}"
     }
     
-    response = requests.get(url, headers=headers)
+    response = github_api.get(url, headers=headers)
     
     if response.status_code == 200:
-        return {milestone["title"]: milestone["number"] for milestone in response.json()}
+        return {milestone["title"]: milestone["number"] for milestone in github_api.decode(response)}
     else:
         print(f"❌ Failed to get milestones")
         print(f"Error: {response.text}")
@@ -27,6 +32,9 @@ def get_milestones(token, repo_owner, repo_name):
 
 def get_issues(token, repo_owner, repo_name, label=None):
     """Get all issues for a repository, optionally filtered by label."""
+    if github_api.USE_GRAPHQL:
+        return github_graphql.get_issues(token, repo_owner, repo_name, labels=label.split(",") if label else None)
+
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues?state=open"
     if label:
         url += f"&labels={label}"
@@ -36,11 +44,11 @@ def get_issues(token, repo_owner, repo_name, label=None):
         "Authorization": f"token {token}"
     }
     
-    response = requests.get(url, headers=headers)
+    response = github_api.get(url, headers=headers)
     
     if response.status_code == 200:
         # Filter out pull requests
-        return [issue for issue in response.json() if "pull_request" not in issue]
+        return [issue for issue in github_api.decode(response) if "pull_request" not in issue]
     else:
         print(f"❌ Failed to get issues")
         print(f"Error: {response.text}")
@@ -57,7 +65,7 @@ def assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milest
         "milestone": milestone_number
     }
     
-    response = requests.patch(url, headers=headers, json=data)
+    response = github_api.patch(url, headers=headers, json=data)
     
     if response.status_code == 200:
         return True
@@ -67,8 +75,9 @@ def assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milest
         return False
 
 def main():
+    github_api.configure_from_argv()
     if len(sys.argv) != 2:
-        print("Usage: python scripts/assign_issues_to_milestones.py <github_token>")
+        print("Usage: python scripts/assign_issues_to_milestones.py <github_token> [--plan] [--graphql]")
         sys.exit(1)
     
     token = sys.argv[1]
@@ -125,18 +134,21 @@ def main():
                 
                 issues = get_issues(token, repo_owner, repo_name, label_query)
                 
-                for issue in issues:
-                    issue_number = issue["number"]
-                    print(f"  - Assigning issue #{issue_number} ({issue['title']}) to milestone '{milestone_title}'")
-                    assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milestone_number)
+                def assign_labelled(issue):
+                    print(f"  - Assigning issue #{issue['number']} ({issue['title']}) to milestone '{milestone_title}'")
+                    assign_issue_to_milestone(token, repo_owner, repo_name, issue["number"], milestone_number)
+                
+                github_api.run_concurrently(assign_labelled, issues)
             
             # Assign specific issues by number
             if "issue_numbers" in rule:
-                for issue_number in rule["issue_numbers"]:
+                def assign_numbered(issue_number):
                     print(f"  - Assigning issue #{issue_number} to milestone '{milestone_title}'")
                     assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milestone_number)
+                
+                github_api.run_concurrently(assign_numbered, rule["issue_numbers"])
     
-    print("\nDone assigning issues to milestones!")
+    print(f"\nDone assigning issues to milestones! (write concurrency {github_api.concurrency_label()})")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """
 Script to assign new issues to their appropriate milestones.
+Usage: python scripts/assign_new_issues.py [--plan]
 """
 
-import requests
+import github_api
 import sys
 
 # Configuration
@@ -45,7 +46,7 @@ def assign_issue_to_milestone(issue_number, milestone_number):
         "milestone": milestone_number
     }
     
-    response = requests.patch(url, headers=headers, json=data)
+    response = github_api.patch(url, headers=headers, json=data)
     
     if response.status_code == 200:
         print(f"✅ Successfully assigned issue #{issue_number} to milestone #{milestone_number}")
@@ -56,12 +57,12 @@ def assign_issue_to_milestone(issue_number, milestone_number):
         return False
 
 def main():
+    github_api.configure_from_argv()
     print("Assigning issues to milestones...")
     
-    for issue_number, milestone_number in ASSIGNMENTS:
-        assign_issue_to_milestone(issue_number, milestone_number)
+    github_api.run_concurrently(lambda assignment: assign_issue_to_milestone(*assignment), ASSIGNMENTS)
     
-    print("\nAssignment complete!")
+    print(f"\nAssignment complete! (write concurrency {github_api.concurrency_label()})")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Compiled matcher for label and title based milestone assignment rules.
+
+A rule is a plain dict naming the milestone it assigns to plus any number of
+conditions. All conditions on a rule must hold for it to match; the first
+matching rule (in list order) wins.
+
+    {
+        "milestone": "Landing Page v1",
+        "labels": ["landing-page", "high-priority"],   # all of these labels
+        "any_labels": ["bug", "enhancement"],          # at least one of these
+        "exclude_labels": ["wontfix"],                 # none of these
+        "title_prefix": "[Landing Page]",              # title starts with
+        "title_regex": r"map|navigation",              # re.search on title
+        "keywords": ["search", "hero"],                # any keyword in title
+        "current_milestone": None,                     # None = no milestone,
+                                                       # or a title / list
+    }
+
+Title prefixes, keywords and label names are matched case-insensitively.
+
+All rules are compiled once into:
+- a single Aho-Corasick automaton over every keyword,
+- a trie over every title prefix,
+- label and milestone lookup tables mapping to rule bitsets,
+so these checks cost one pass over the title and labels regardless of how
+many rules there are. Title regexes are compiled per rule (so inline flags
+and backreferences work as usual) and only tried on rules that passed every
+other check.
+"""
+
+import re
+from collections import deque
+
+NO_MILESTONE = object()
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton mapping keywords to rule bitsets."""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [0]
+
+    def add(self, keyword, mask):
+        state = 0
+        for char in keyword:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(0)
+            state = next_state
+        self.output[state] |= mask
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def scan(self, text):
+        """Return the OR of the rule masks of every keyword found in text."""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        hits = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            hits |= output[state]
+        return hits
+
+    def scan_prefixes(self, text):
+        """Return the OR of the rule masks of every keyword text starts with."""
+        goto, output = self.goto, self.output
+        state = 0
+        hits = 0
+        for char in text:
+            state = goto[state].get(char)
+            if state is None:
+                break
+            hits |= output[state]
+        return hits
+
+
+def _as_list(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+class RuleMatcher:
+    """Match issues against a list of assignment rules using precompiled tables."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        all_rules = (1 << len(self.rules)) - 1
+
+        self.label_bits = {}
+        self.any_label_rules = {}
+        self.exclude_label_rules = {}
+        self.required_sets = {}
+        self.milestone_rules = {}
+
+        keyword_rules = 0
+        prefix_rules = 0
+        any_label_rules = 0
+        milestone_rules = 0
+        self.automaton = KeywordAutomaton()
+        self.prefixes = KeywordAutomaton()
+        self.regexes = {}  # rule bit -> compiled title_regex
+        self.regex_rules = 0
+
+        for index, rule in enumerate(self.rules):
+            if "milestone" not in rule:
+                raise ValueError(f"Rule #{index + 1} has no 'milestone'")
+            bit = 1 << index
+
+            for keyword in rule.get("keywords", []):
+                self.automaton.add(keyword.lower(), bit)
+                keyword_rules |= bit
+
+            if rule.get("title_prefix"):
+                self.prefixes.add(rule["title_prefix"].lower(), bit)
+                prefix_rules |= bit
+            if rule.get("title_regex"):
+                self.regexes[bit] = re.compile(rule["title_regex"])
+                self.regex_rules |= bit
+
+            required = 0
+            for label in rule.get("labels", []):
+                required |= self._label_bit(label)
+            self.required_sets[required] = self.required_sets.get(required, 0) | bit
+
+            if rule.get("any_labels"):
+                any_label_rules |= bit
+                for label in rule["any_labels"]:
+                    key = label.lower()
+                    self.any_label_rules[key] = self.any_label_rules.get(key, 0) | bit
+
+            for label in rule.get("exclude_labels", []):
+                key = label.lower()
+                self.exclude_label_rules[key] = self.exclude_label_rules.get(key, 0) | bit
+
+            if "current_milestone" in rule:
+                milestone_rules |= bit
+                for title in _as_list(rule["current_milestone"]):
+                    key = NO_MILESTONE if title is None else title
+                    self.milestone_rules[key] = self.milestone_rules.get(key, 0) | bit
+
+        self.automaton.build()
+
+        # Rules without a condition of a given kind pass that check for free
+        self.keyword_free = all_rules & ~keyword_rules
+        self.prefix_free = all_rules & ~prefix_rules
+        self.any_label_free = all_rules & ~any_label_rules
+        self.milestone_free = all_rules & ~milestone_rules
+
+    def _label_bit(self, label):
+        key = label.lower()
+        if key not in self.label_bits:
+            self.label_bits[key] = 1 << len(self.label_bits)
+        return self.label_bits[key]
+
+    def _required_ok(self, label_mask):
+        """Rules whose required label set is a subset of label_mask."""
+        required_sets = self.required_sets
+        if bin(label_mask).count("1") > 12:
+            return sum(rules for required, rules in required_sets.items() if required & ~label_mask == 0)
+        # Walk every subset of the issue's known labels; issues carry few labels
+        ok = required_sets.get(0, 0)
+        subset = label_mask
+        while subset:
+            ok |= required_sets.get(subset, 0)
+            subset = (subset - 1) & label_mask
+        return ok
+
+    def candidate_mask(self, issue):
+        """Return the bitset of rules matching the issue, title regexes aside."""
+        title = issue.get("title") or ""
+        lowered = title.lower()
+
+        keyword_ok = self.keyword_free | self.automaton.scan(lowered)
+        prefix_ok = self.prefix_free | self.prefixes.scan_prefixes(lowered)
+
+        label_mask = 0
+        any_label_ok = self.any_label_free
+        excluded = 0
+        for label in issue.get("labels", []):
+            name = (label["name"] if isinstance(label, dict) else label).lower()
+            label_mask |= self.label_bits.get(name, 0)
+            any_label_ok |= self.any_label_rules.get(name, 0)
+            excluded |= self.exclude_label_rules.get(name, 0)
+
+        milestone = issue.get("milestone")
+        if isinstance(milestone, dict):
+            milestone = milestone.get("title")
+        milestone_ok = self.milestone_free | self.milestone_rules.get(
+            NO_MILESTONE if milestone is None else milestone, 0)
+
+        return keyword_ok & prefix_ok & any_label_ok & milestone_ok & self._required_ok(label_mask) & ~excluded
+
+    def _regex_ok(self, bit, title):
+        return not bit & self.regex_rules or self.regexes[bit].search(title) is not None
+
+    def match_mask(self, issue):
+        """Return the bitset of every rule matching the issue."""
+        title = issue.get("title") or ""
+        mask = self.candidate_mask(issue)
+        pending = mask & self.regex_rules
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            if not self._regex_ok(bit, title):
+                mask ^= bit
+        return mask
+
+    def match(self, issue):
+        """Return the first rule matching the issue, or None."""
+        title = issue.get("title") or ""
+        mask = self.candidate_mask(issue)
+        # Regexes are tried in rule order only until the first rule passes
+        while mask:
+            bit = mask & -mask
+            if self._regex_ok(bit, title):
+                return self.rules[bit.bit_length() - 1]
+            mask ^= bit
+        return None
+
+    def match_all(self, issues):
+        """Yield (issue, rule) for every issue in a stream that matches a rule."""
+        for issue in issues:
+            rule = self.match(issue)
+            if rule is not None:
+                yield issue, rule
+
+
+def compile_rules(rules):
+    """Compile a list of rule dicts into a RuleMatcher."""
+    return RuleMatcher(rules)
@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """
 Script to create GitHub milestones for the project.
-Usage: python scripts/create_milestones.py <github_token>
+Usage: python scripts/create_milestones.py <github_token> [--plan]
 """
 
 import sys
-import requests
+import github_api
 import json
 from datetime import datetime, timedelta
 
@@ -27,7 +27,7 @@ def create_milestone(token, repo_owner, repo_name, title, description, due_date=
         data["due_on"] = due_date
     
     print(f"Creating milestone: {title}")
-    response = requests.post(url, headers=headers, json=data)
+    response = github_api.create(url, headers=headers, json=data)
     
     if response.status_code == 201:
         print(f"✅ Successfully created milestone: {title}")
@@ -38,8 +38,9 @@ def create_milestone(token, repo_owner, repo_name, title, description, due_date=
         return None
 
 def main():
+    github_api.configure_from_argv()
     if len(sys.argv) != 2:
-        print("Usage: python scripts/create_milestones.py <github_token>")
+        print("Usage: python scripts/create_milestones.py <github_token> [--plan]")
         sys.exit(1)
     
     token = sys.argv[1]
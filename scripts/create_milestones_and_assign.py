@@ -2,10 +2,12 @@
 """
 Script to create GitHub milestones and assign issues.
 This script reads a token from a file for security.
+Usage: python scripts/create_milestones_and_assign.py [--plan] [--graphql]
 """
 
 import sys
-import requests
+import github_api
+import github_graphql
 import json
 import os
 
@@ -74,7 +76,7 @@ def create_milestone(title, description, due_date=None):
         data["due_on"] = due_date
     
     print(f"Creating milestone: {title}")
-    response = requests.post(url, headers=headers, json=data)
+    response = github_api.create(url, headers=headers, json=data)
     
     if response.status_code == 201:
         print(f"✅ Successfully created milestone: {title}")
@@ -86,16 +88,19 @@ def create_milestone(title, description, due_date=None):
 
 def get_milestones():
     """Get all milestones from the repository."""
+    if github_api.USE_GRAPHQL:
+        return github_graphql.get_milestones(TOKEN, REPO_OWNER, REPO_NAME) or []
+
     url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/milestones"
     headers = {
         "Accept": "application/vnd.github.v3+json",
         "Authorization": f"token {TOKEN}"
     }
     
-    response = requests.get(url, headers=headers)
+    response = github_api.get(url, headers=headers)
     
     if response.status_code == 200:
-        return response.json()
+        return github_api.decode(response)
     else:
         print(f"❌ Failed to get milestones.")
         print(f"Error: {response.text}")
@@ -113,7 +118,7 @@ def assign_issue_to_milestone(issue_number, milestone_number):
         "milestone": milestone_number
     }
     
-    response = requests.patch(url, headers=headers, json=data)
+    response = github_api.patch(url, headers=headers, json=data)
     
     if response.status_code == 200:
         print(f"✅ Successfully assigned issue #{issue_number} to milestone #{milestone_number}")
@@ -124,6 +129,7 @@ def assign_issue_to_milestone(issue_number, milestone_number):
         return False
 
 def main():
+    github_api.configure_from_argv()
     print("Creating milestones and assigning issues...")
     
     # Check if milestones already exist
@@ -150,17 +156,24 @@ def main():
             print(f"Milestone '{milestone['title']}' already exists.")
     
     # Assign issues to milestones
+    assignments = []
     for milestone in MILESTONES:
         if milestone["title"] in milestone_map and milestone["issue_ids"]:
             milestone_number = milestone_map[milestone["title"]]
             
             for issue_id in milestone["issue_ids"]:
-                assign_issue_to_milestone(issue_id, milestone_number)
+                assignments.append((issue_id, milestone_number))
+    
+    github_api.run_concurrently(lambda assignment: assign_issue_to_milestone(*assignment), assignments)
     
     print("\nSummary of milestones:")
     for title, number in milestone_map.items():
         print(f"- {title}: #{number}")
 
+    # Keep the token for the real run when only planning
+    if github_api.PLAN_MODE:
+        return
+
     # Delete token file for security
     try:
         os.remove(TOKEN_FILE)
@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """
 Interactive script to create GitHub milestones for the project.
-Usage: python scripts/create_milestones_interactive.py
+Usage: python scripts/create_milestones_interactive.py [--plan]
 """
 
 import sys
-import requests
+import github_api
 import json
 import getpass
 from datetime import datetime, timedelta
@@ -28,7 +28,7 @@ def create_milestone(token, repo_owner, repo_name, title, description, due_date=
         data["due_on"] = due_date
     
     print(f"Creating milestone: {title}")
-    response = requests.post(url, headers=headers, json=data)
+    response = github_api.create(url, headers=headers, json=data)
     
     if response.status_code == 201:
         print(f"✅ Successfully created milestone: {title}")
@@ -39,6 +39,7 @@ def create_milestone(token, repo_owner, repo_name, title, description, due_date=
         return None
 
 def main():
+    github_api.configure_from_argv()
     repo_owner = input("Enter GitHub repository owner (default: samsiso): ") or "samsiso"
     repo_name = input("Enter GitHub repository name (default: mallocra-activities): ") or "mallocra-activities"
     
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Script to export issues, milestones and labels for offline analysis.
+Usage: python scripts/export_issues.py <github_token> <output_dir> [--since=<ISO date>|last]
+
+Records are streamed page by page, so memory use stays constant regardless of
+repository size. Each table is written to:
+- <table>.ndjson, one JSON record per line (appended to on every run)
+- <table>-<run>.parquet, if pyarrow is installed, else <table>-<run>.csv.gz
+
+With --since only issues and milestones updated since that time are fetched
+and appended; --since=last resumes from the previous export. Readers should
+keep the last record seen for each number. Labels are small and always
+exported in full.
+"""
+
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+
+import github_api
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+STATE_FILE = "export_state.json"
+ROW_GROUP_SIZE = 10000
+
+COLUMNS = {
+    "issues": ["number", "title", "state", "milestone_number", "milestone_title", "labels",
+               "author", "comments", "created_at", "updated_at", "closed_at"],
+    "milestones": ["number", "title", "state", "description", "due_on", "open_issues",
+                   "closed_issues", "created_at", "updated_at", "closed_at"],
+    "labels": ["name", "color", "description"],
+}
+
+INTEGER_COLUMNS = {"number", "milestone_number", "comments", "open_issues", "closed_issues"}
+
+
+def issue_record(issue):
+    """Flatten a REST issue into an export row."""
+    milestone = issue.get("milestone") or {}
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "state": issue["state"],
+        "milestone_number": milestone.get("number"),
+        "milestone_title": milestone.get("title"),
+        "labels": ",".join(label["name"] for label in issue.get("labels", [])),
+        "author": (issue.get("user") or {}).get("login"),
+        "comments": issue.get("comments"),
+        "created_at": issue.get("created_at"),
+        "updated_at": issue.get("updated_at"),
+        "closed_at": issue.get("closed_at"),
+    }
+
+
+def milestone_record(milestone):
+    return {column: milestone.get(column) for column in COLUMNS["milestones"]}
+
+
+def label_record(label):
+    return {column: label.get(column) for column in COLUMNS["labels"]}
+
+
+class ColumnarWriter:
+    """Write rows to Parquet (pyarrow) or gzipped CSV in bounded batches."""
+
+    def __init__(self, path_prefix, columns):
+        self.columns = columns
+        self.rows = []
+        self.count = 0
+        if pa is not None:
+            self.path = f"{path_prefix}.parquet"
+            self.schema = pa.schema([(column, pa.int64() if column in INTEGER_COLUMNS else pa.string())
+                                     for column in columns])
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        else:
+            self.path = f"{path_prefix}.csv.gz"
+            self.file = gzip.open(self.path, "wt", newline="")
+            self.writer = csv.DictWriter(self.file, fieldnames=columns)
+            self.writer.writeheader()
+
+    def write(self, row):
+        self.rows.append(row)
+        self.count += 1
+        if len(self.rows) >= ROW_GROUP_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if pa is not None:
+            self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+        else:
+            self.writer.writerows(self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        if pa is not None:
+            self.writer.close()
+        else:
+            self.file.close()
+
+
+def export_table(name, pages, to_record, output_dir, run_id, append, keep=None):
+    """Stream pages of records into NDJSON and a columnar file."""
+    ndjson_path = os.path.join(output_dir, f"{name}.ndjson")
+    columnar = ColumnarWriter(os.path.join(output_dir, f"{name}-{run_id}"), COLUMNS[name])
+
+    with open(ndjson_path, "a" if append else "w") as ndjson:
+        for page in pages:
+            for item in page:
+                if keep is not None and not keep(item):
+                    continue
+                record = to_record(item)
+                ndjson.write(json.dumps(record, separators=(",", ":")) + "\n")
+                columnar.write(record)
+    columnar.close()
+
+    print(f"✅ Exported {columnar.count} {name} to {ndjson_path} and {columnar.path}")
+    return columnar.count
+
+
+def load_state(output_dir):
+    try:
+        with open(os.path.join(output_dir, STATE_FILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(output_dir, state):
+    with open(os.path.join(output_dir, STATE_FILE), "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def main():
+    github_api.configure_from_argv()
+    since = None
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--since="):
+            since = arg.split("=", 1)[1]
+        else:
+            args.append(arg)
+
+    if len(args) != 2:
+        print("Usage: python scripts/export_issues.py <github_token> <output_dir> [--since=<ISO date>|last]")
+        sys.exit(1)
+
+    token, output_dir = args
+    repo_owner = "samsiso"
+    repo_name = "mallocra-activities"
+    base_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    state = load_state(output_dir)
+    if since == "last":
+        since = state.get("last_export")
+        if not since:
+            print("No previous export found, exporting everything.")
+
+    # Taken before fetching so records changed during the run are picked up next time
+    started = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    run_id = started.replace(":", "").replace("-", "")
+    if pa is None:
+        print("pyarrow not installed, writing CSV instead of Parquet.")
+
+    issue_params = {"state": "all", "sort": "updated", "direction": "asc"}
+    if since:
+        issue_params["since"] = since
+        print(f"Exporting records updated since {since}...")
+
+    try:
+        export_table(
+            "issues",
+            github_api.iter_pages(f"{base_url}/issues", headers=headers, params=issue_params),
+            issue_record, output_dir, run_id, append=bool(since),
+            keep=lambda issue: "pull_request" not in issue,
+        )
+        export_table(
+            "milestones",
+            github_api.iter_pages(f"{base_url}/milestones", headers=headers, params={"state": "all"}),
+            milestone_record, output_dir, run_id, append=bool(since),
+            keep=lambda milestone: not since or milestone["updated_at"] >= since,
+        )
+        export_table(
+            "labels",
+            github_api.iter_pages(f"{base_url}/labels", headers=headers),
+            label_record, output_dir, run_id, append=False,
+        )
+    except RuntimeError as e:
+        print(f"❌ Export failed")
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    state["last_export"] = started
+    save_state(output_dir, state)
+    print(f"\nDone! Next incremental run: python scripts/export_issues.py <github_token> {output_dir} --since=last")
+
+if __name__ == "__main__":
+    main()
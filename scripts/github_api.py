@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP helpers for the GitHub scripts.
+
+Scripts call github_api.get/post/patch exactly like requests.get/post/patch.
+Every call goes through request(), which records latencies and, in plan mode,
+turns writes into planned requests instead of sending them.
+
+Requests get adaptive per-endpoint timeouts derived from observed latencies.
+Idempotent requests (GETs, GraphQL queries and PATCHes, which set absolute
+values) are retried on timeouts, connection errors and 5xx responses, and
+reads still running past the endpoint's p95 latency are hedged with a
+duplicate request. POSTs are never retried blindly: create() checks for an
+existing record by title first.
+
+Writes pass through an AIMD controller (WRITE_LIMITER) that bounds how many
+are in flight: the limit grows additively while writes are fast and healthy
+and is halved on secondary rate limits, 5xx errors and latency spikes.
+
+Common options (stripped from sys.argv by configure_from_argv()):
+    --plan              Perform reads but only plan writes, then print the
+                        requests that would be issued, the rate-limit quota
+                        they need and a projected wall-clock time.
+    --concurrency=N     Fix write concurrency at N instead of adapting it.
+    --graphql           Read issues and milestones through the GraphQL API,
+                        fetching only the fields the scripts use.
+    --record=FILE       Record all traffic to a cassette (see github_cassette.py).
+    --replay=FILE       Replay traffic from a cassette instead of the network.
+    --replay-speed=X    Scale recorded timings by X when replaying (default 0,
+                        i.e. no delays).
+    --daemon[=SOCKET]   Forward requests to a running github_daemon.py, which
+                        shares warm connections, caches and quota between runs.
+    --profile[=FILE]    Time the fetch/decode/plan/apply phases of the run and
+                        write a JSON report (see github_profile.py).
+    --cprofile=FILE     Profile as above and also write a cProfile of the run.
+"""
+
+import atexit
+import json
+import random
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from concurrent import futures
+
+import requests
+
+import github_cassette
+import github_daemon
+import github_profile
+
+API_URL = "https://api.github.com"
+GRAPHQL_URL = f"{API_URL}/graphql"
+STATS_FILE = os.path.join(os.path.expanduser("~"), ".cache", "mallocra-github", "latency.json")
+MAX_SAMPLES = 200
+
+# Fallback latencies (seconds) used before any request has been measured
+DEFAULT_LATENCY = {"GET": 0.4, "POST": 0.9, "PATCH": 0.7, "PUT": 0.7, "DELETE": 0.5}
+
+# Timeouts (seconds). Read timeouts adapt to each endpoint's p99 latency once
+# MIN_SAMPLES requests have been measured.
+CONNECT_TIMEOUT = 3.05
+DEFAULT_TIMEOUT = 30
+MIN_TIMEOUT = 5
+MAX_TIMEOUT = 60
+TIMEOUT_FACTOR = 4
+MIN_SAMPLES = 20
+
+IDEMPOTENT_METHODS = {"GET", "PATCH"}
+MAX_RETRIES = 3
+HEDGE_PERCENTILE = 95
+
+# Adaptive (AIMD) write concurrency
+INITIAL_CONCURRENCY = 2
+MAX_CONCURRENCY = 16
+DECREASE_FACTOR = 0.5
+LATENCY_SPIKE_FACTOR = 3
+SECONDARY_LIMIT_WAIT = 60
+
+# GitHub secondary limit on content-creating requests
+WRITES_PER_MINUTE = 80
+WRITES_PER_HOUR = 500
+
+PLAN_MODE = False
+CONCURRENCY = None  # fixed by --concurrency, otherwise adaptive
+USE_GRAPHQL = False
+
+_auth_headers = {}
+_sent = []       # (method, url, seconds) of requests actually sent, in plan mode
+_planned = []    # (method, url, payload) of writes that were only planned
+_samples = {}    # method or "METHOD /endpoint" -> recent latencies, from STATS_FILE
+_samples_loaded = False
+_transport = requests.request  # swapped for a cassette Recorder/Player
+_profiler = None  # github_profile.Profiler when --profile is given
+_no_phase = nullcontext()
+
+
+class WriteLimiter:
+    """AIMD controller bounding the number of writes in flight.
+
+    Each healthy write raises the level by 1/level (about +1 per round of
+    writes); an unhealthy one multiplies it by DECREASE_FACTOR. Feedback from
+    writes started before the last decrease is ignored, so one burst of
+    failures only cuts the level once.
+    """
+
+    def __init__(self, initial, maximum):
+        self.level = float(initial)
+        self.maximum = maximum
+        self.fixed = False
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return max(1, int(self.level))
+
+    def fix(self, level):
+        """Disable adaptation and hold the limit at level."""
+        self.level = float(level)
+        self.fixed = True
+
+    def pause(self, seconds):
+        """Hold back every new write for the given time."""
+        with self.condition:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def acquire(self):
+        """Wait for a free slot; return the start time to pass to release()."""
+        with self.condition:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < self.limit:
+                    break
+                self.condition.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, started, trouble=None):
+        """Free a slot and adapt the limit to how the write went."""
+        with self.condition:
+            self.in_flight -= 1
+            before = self.limit
+            if not self.fixed:
+                if trouble is None:
+                    self.level = min(self.maximum, self.level + 1 / self.level)
+                elif started >= self.last_decrease:
+                    self.level = max(1.0, self.level * DECREASE_FACTOR)
+                    self.last_decrease = time.monotonic()
+            after = self.limit
+            self.condition.notify_all()
+        if after != before:
+            print(f"⚙️  Write concurrency {before} → {after}" + (f" ({trouble})" if trouble else ""))
+
+
+WRITE_LIMITER = WriteLimiter(INITIAL_CONCURRENCY, MAX_CONCURRENCY)
+
+
+class LocalResponse:
+    """Stand-in response for results produced without a matching request."""
+
+    def __init__(self, status_code, url, data, text):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.url = url
+        self.headers = {}
+        self.links = {}
+        self.text = text
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class PlannedResponse(LocalResponse):
+    """Stand-in response returned for writes in plan mode."""
+
+    def __init__(self, method, url, payload):
+        data = dict(payload or {}, number=None, html_url=None)
+        super().__init__(201 if method == "POST" else 200, url, data, "(planned)")
+
+
+def configure_from_argv(argv=None):
+    """Apply and strip the common --plan / --concurrency / --graphql options."""
+    global CONCURRENCY, USE_GRAPHQL
+    argv = sys.argv if argv is None else argv
+    remaining = []
+    replay_path = None
+    replay_speed = 0
+    profile_path = None
+    cprofile_path = None
+    for arg in argv:
+        if arg.startswith("--record="):
+            use_transport(github_cassette.Recorder(arg.split("=", 1)[1]))
+        elif arg.startswith("--replay="):
+            replay_path = arg.split("=", 1)[1]
+        elif arg.startswith("--replay-speed="):
+            replay_speed = float(arg.split("=", 1)[1])
+        elif arg == "--daemon" or arg.startswith("--daemon="):
+            use_daemon(arg.split("=", 1)[1] if "=" in arg else github_daemon.DEFAULT_SOCKET)
+        elif arg == "--plan":
+            enable_plan_mode()
+        elif arg.startswith("--concurrency="):
+            CONCURRENCY = max(1, int(arg.split("=", 1)[1]))
+            WRITE_LIMITER.fix(CONCURRENCY)
+        elif arg == "--graphql":
+            USE_GRAPHQL = True
+        elif arg == "--profile" or arg.startswith("--profile="):
+            profile_path = arg.split("=", 1)[1] if "=" in arg else ""
+        elif arg.startswith("--cprofile="):
+            cprofile_path = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+    if replay_path:
+        use_transport(github_cassette.Player(replay_path, replay_speed))
+    if profile_path is not None or cprofile_path:
+        script = os.path.splitext(os.path.basename(argv[0]))[0]
+        enable_profiling(profile_path or f"{script}-profile.json", cprofile_path)
+    argv[:] = remaining
+    return argv
+
+
+def use_daemon(path):
+    """Forward requests to the local daemon, if it is running."""
+    client = github_daemon.DaemonClient(path)
+    if client.is_running():
+        use_transport(client)
+    else:
+        print(f"⚠️  GitHub daemon not running on {path}, sending requests directly.")
+
+
+def use_transport(transport):
+    """Send all requests through a cassette Recorder/Player or the daemon."""
+    global _transport
+    if _transport is not requests.request:
+        _transport.close()  # Replaced before it sent anything
+    _transport = transport
+
+
+def _shutdown():
+    """Print the plan and profile, save latencies, then close the transport.
+
+    The plan checks the rate limit, so it must run while the transport is open.
+    """
+    if PLAN_MODE:
+        print_plan()
+    if _profiler:
+        _profiler.stop()
+    if _samples_loaded:
+        _save_samples()
+    if _transport is not requests.request:
+        _transport.close()
+
+
+atexit.register(_shutdown)
+
+
+def enable_plan_mode():
+    """Switch to plan mode and print the plan when the script exits."""
+    global PLAN_MODE
+    if not PLAN_MODE:
+        PLAN_MODE = True
+        print("📝 Plan mode: reads are performed, writes are only planned.")
+
+
+def enable_profiling(report_path, cprofile_path=None):
+    """Time the phases of the run and write a report when the script exits."""
+    global _profiler
+    if _profiler is None:
+        _profiler = github_profile.Profiler(report_path, cprofile_path)
+        _profiler.start()
+
+
+def phase(name):
+    """Context manager marking a fetch/decode/plan/apply phase for --profile."""
+    return _profiler.phase(name) if _profiler else _no_phase
+
+
+def decode(response):
+    """Parse a response's JSON body, timed as the decode phase."""
+    with phase("decode"):
+        return response.json()
+
+
+def is_read(method, url):
+    """GraphQL queries are POSTs but never modify anything."""
+    return method == "GET" or url == GRAPHQL_URL
+
+
+def request(method, url, **kwargs):
+    """Send (or, in plan mode, plan) a request and record its latency."""
+    method = method.upper()
+    headers = kwargs.get("headers") or {}
+    if "Authorization" in headers:
+        _auth_headers["Authorization"] = headers["Authorization"]
+
+    if PLAN_MODE and not is_read(method, url):
+        _planned.append((method, url, kwargs.get("json")))
+        return PlannedResponse(method, url, kwargs.get("json"))
+
+    if method not in IDEMPOTENT_METHODS and not is_read(method, url):
+        return _send_write(method, url, kwargs)
+
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+        try:
+            response = _send_hedged(method, url, kwargs) if is_read(method, url) else _send_write(method, url, kwargs)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if last_attempt:
+                raise
+            print(f"⚠️  {method} {_endpoint(url)} failed ({type(e).__name__}), retrying...")
+        else:
+            if response.status_code < 500 or last_attempt:
+                return response
+            print(f"⚠️  {method} {_endpoint(url)} returned {response.status_code}, retrying...")
+        time.sleep(_backoff(attempt))
+
+
+def create(url, **kwargs):
+    """POST a new issue or milestone, retrying without creating duplicates.
+
+    A POST that timed out may still have created the record, so before each
+    retry the collection is searched for a record with the same title.
+    """
+    if PLAN_MODE:
+        return request("POST", url, **kwargs)
+
+    title = kwargs["json"]["title"]
+    since = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - 300))
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+        try:
+            response = request("POST", url, **kwargs)
+        except (requests.Timeout, requests.ConnectionError):
+            if last_attempt:
+                raise
+        else:
+            if response.status_code < 500 or last_attempt:
+                return response
+
+        existing = find_by_title(url, title, since, kwargs.get("headers"))
+        if existing:
+            print(f"⚠️  '{title}' was created by an earlier attempt, not posting again")
+            return LocalResponse(201, url, existing, json.dumps(existing))
+        time.sleep(_backoff(attempt))
+
+
+def find_by_title(url, title, since, headers=None):
+    """Find a milestone or issue by exact title in the collection at url."""
+    params = {"state": "all", "per_page": 100}
+    if url.rstrip("/").endswith("/issues"):
+        # Only issues touched since the first attempt can be the lost one
+        params.update({"since": since, "sort": "created", "direction": "desc"})
+
+    try:
+        for page in iter_pages(url, headers=headers, params=params):
+            for record in page:
+                if record.get("title") == title and "pull_request" not in record:
+                    return record
+    except RuntimeError:
+        pass
+    return None
+
+
+def iter_pages(url, headers=None, params=None):
+    """Yield each page of a paginated REST listing, following Link headers."""
+    params = dict(params or {})
+    params.setdefault("per_page", 100)
+
+    while url:
+        response = request("GET", url, headers=headers, params=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {_endpoint(url)} failed: {response.status_code} {response.text}")
+        yield decode(response)
+        url = response.links.get("next", {}).get("url")
+        params = None  # The next link already carries the query string
+
+
+def run_concurrently(func, items):
+    """Call func on every item from a pool of worker threads.
+
+    Writes made by func are throttled by WRITE_LIMITER, so the pool only needs
+    to be as large as the highest concurrency the limiter may allow.
+    Results are returned in item order.
+    """
+    def apply(item):
+        with phase("apply"):
+            return func(item)
+
+    items = list(items)
+    workers = CONCURRENCY or MAX_CONCURRENCY
+    if workers <= 1 or len(items) <= 1:
+        return [apply(item) for item in items]
+    with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(apply, items))
+
+
+def concurrency_label():
+    """Describe the current write concurrency for script output."""
+    if CONCURRENCY:
+        return str(CONCURRENCY)
+    return f"{WRITE_LIMITER.limit} (adaptive)"
+
+
+def adaptive_timeout(method, url):
+    """Return a (connect, read) timeout from the endpoint's p99 latency."""
+    p99 = endpoint_percentile(method, url, 99)
+    if p99 is None:
+        return (CONNECT_TIMEOUT, DEFAULT_TIMEOUT)
+    return (CONNECT_TIMEOUT, min(MAX_TIMEOUT, max(MIN_TIMEOUT, p99 * TIMEOUT_FACTOR)))
+
+
+def _backoff(attempt):
+    return min(10, 0.5 * 2 ** attempt) * (0.5 + random.random())
+
+
+def _send(method, url, kwargs):
+    kwargs = dict(kwargs)
+    kwargs.setdefault("timeout", adaptive_timeout(method, url))
+    start = time.perf_counter()
+    try:
+        response = _transport(method, url, **kwargs)
+    except requests.Timeout:
+        # Count the timeout as a slow sample so the next timeout adapts
+        _record_latency(method, url, time.perf_counter() - start)
+        raise
+    elapsed = time.perf_counter() - start
+    if PLAN_MODE:
+        # Only the plan needs these; long-running watchers would grow the list forever
+        _sent.append((method, response.url or url, elapsed))
+    _record_latency(method, url, elapsed)
+    return response
+
+
+def _send_write(method, url, kwargs):
+    """Send a write through WRITE_LIMITER, waiting out secondary rate limits."""
+    for attempt in range(MAX_RETRIES + 1):
+        started = WRITE_LIMITER.acquire()
+        try:
+            with phase("fetch"):
+                response = _send(method, url, kwargs)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            WRITE_LIMITER.release(started, type(e).__name__)
+            raise
+        trouble = _write_trouble(method, url, response, time.monotonic() - started)
+        WRITE_LIMITER.release(started, trouble)
+        if trouble != "secondary rate limit" or attempt == MAX_RETRIES:
+            return response
+
+        # Writes rejected by the secondary limit were not applied, so even a
+        # POST can safely be sent again once the limit has passed.
+        wait = float(response.headers.get("Retry-After") or SECONDARY_LIMIT_WAIT)
+        print(f"⏳ Secondary rate limit hit, pausing writes for {wait:.0f}s...")
+        WRITE_LIMITER.pause(wait)
+
+
+def _write_trouble(method, url, response, elapsed):
+    """Return why a write should slow the limiter down, or None if healthy."""
+    if response.status_code in (403, 429) and (
+            "Retry-After" in response.headers or "secondary rate limit" in response.text.lower()):
+        return "secondary rate limit"
+    if response.status_code >= 500:
+        return f"HTTP {response.status_code}"
+    p50 = endpoint_percentile(method, url, 50)
+    if p50 is not None and elapsed > LATENCY_SPIKE_FACTOR * p50:
+        return "latency spike"
+    return None
+
+
+def _send_hedged(method, url, kwargs):
+    """Send a request, duplicating it if it runs past the endpoint's p95.
+
+    The wait is timed as fetch on the calling thread, where it is spent,
+    rather than in the threads sending the request.
+    """
+    with phase("fetch"):
+        return _hedge(method, url, kwargs)
+
+
+def _hedge(method, url, kwargs):
+    delay = endpoint_percentile(method, url, HEDGE_PERCENTILE)
+    if delay is None:
+        return _send(method, url, kwargs)
+
+    outcomes = queue.Queue()
+
+    def attempt():
+        try:
+            outcomes.put((True, _send(method, url, kwargs)))
+        except Exception as e:
+            outcomes.put((False, e))
+
+    # Daemon threads, so a stalled request that lost the race never holds
+    # the process open at exit
+    threading.Thread(target=attempt, daemon=True).start()
+    pending = 1
+    try:
+        ok, result = outcomes.get(timeout=delay)
+    except queue.Empty:
+        threading.Thread(target=attempt, daemon=True).start()
+        pending = 2
+        ok, result = outcomes.get()
+    pending -= 1
+    while not ok and pending:
+        ok, result = outcomes.get()
+        pending -= 1
+    if ok:
+        return result
+    raise result
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
+
+
+def _load_samples():
+    global _samples_loaded
+    if not _samples_loaded:
+        _samples_loaded = True
+        try:
+            with open(STATS_FILE, "r") as f:
+                _samples.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return _samples
+
+
+def _save_samples():
+    # Replayed timings are not real measurements
+    if isinstance(_transport, github_cassette.Player):
+        return
+    try:
+        os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
+        with open(STATS_FILE, "w") as f:
+            json.dump(_samples, f)
+    except OSError:
+        pass
+
+
+def _record_latency(method, url, seconds):
+    for key in (method, f"{method} {_endpoint(url)}"):
+        samples = _load_samples().setdefault(key, [])
+        samples.append(round(seconds, 4))
+        del samples[:-MAX_SAMPLES]
+
+
+def _percentile(samples, percentile):
+    samples = sorted(samples)
+    index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def latency_percentile(method, percentile):
+    """Return a latency percentile (seconds) from recent measurements."""
+    samples = _load_samples().get(method, [])
+    if not samples:
+        return DEFAULT_LATENCY.get(method, 0.5)
+    return _percentile(samples, percentile)
+
+
+def endpoint_percentile(method, url, percentile):
+    """Return an endpoint's latency percentile, or None if too few samples."""
+    samples = _load_samples().get(f"{method} {_endpoint(url)}", [])
+    if len(samples) < MIN_SAMPLES:
+        return None
+    return _percentile(samples, percentile)
+
+
+def get_rate_limit():
+    """Return the rate-limit status of every resource; this call does not use quota."""
+    try:
+        response = _transport("GET", f"{API_URL}/rate_limit", headers=dict(_auth_headers, Accept="application/vnd.github.v3+json"), timeout=10)
+    except (requests.RequestException, LookupError):
+        return None
+    if response.status_code != 200:
+        return None
+    return response.json()["resources"]
+
+
+def _endpoint(url):
+    """Collapse a URL to its endpoint shape, e.g. /repos/o/r/issues/{n}."""
+    path = re.sub(r"^https://api\.github\.com", "", url.split("?")[0])
+    return re.sub(r"/\d+(?=/|$)", "/{n}", path)
+
+
+def _format_seconds(seconds):
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}min"
+    return f"{seconds / 3600:.1f}h"
+
+
+def project_write_time(writes, percentile):
+    """Project the wall-clock seconds needed to send the planned writes."""
+    if not writes:
+        return 0.0
+    total = sum(latency_percentile(method, percentile) for method, _, _ in writes) / (CONCURRENCY or WRITE_LIMITER.limit)
+    # Writes cannot go faster than the secondary content-creation limit
+    return max(total, (len(writes) - 1) * 60.0 / WRITES_PER_MINUTE)
+
+
+def print_plan():
+    """Print the requests that would be issued, their quota and wall time."""
+    groups = {}
+    for method, url, _ in _sent:
+        groups.setdefault((method, _endpoint(url)), 0)
+        groups[(method, _endpoint(url))] += 1
+    for method, url, _ in _planned:
+        groups.setdefault((method, _endpoint(url)), 0)
+        groups[(method, _endpoint(url))] += 1
+
+    print("\n📋 Plan")
+    print(f"   Requests: {len(_sent)} reads (performed), {len(_planned)} writes (planned)")
+    for (method, endpoint), count in sorted(groups.items()):
+        unit = "pages" if is_read(method, API_URL + endpoint) else "requests"
+        print(f"   {method:6} {endpoint}  × {count} {unit}")
+
+    # GraphQL queries draw on their own point budget, not the core quota
+    graphql = sum(1 for _, url, _ in _sent if url == GRAPHQL_URL)
+    quotas = [("core", "Quota", len(_sent) + len(_planned) - graphql)]
+    if graphql:
+        quotas.append(("graphql", "GraphQL quota", graphql))
+    resources = get_rate_limit()
+    for resource, label, total in quotas:
+        status = resources.get(resource) if resources else None
+        if status:
+            reset_in = max(0, status["reset"] - time.time())
+            fits = "✅ fits" if total <= status["remaining"] else "❌ does NOT fit"
+            print(f"   {label}: {total} of {status['remaining']}/{status['limit']} remaining points "
+                  f"(resets in {_format_seconds(reset_in)}) — {fits}")
+        else:
+            print(f"   {label}: {total} points (rate-limit status unavailable)")
+    if len(_planned) > WRITES_PER_HOUR:
+        print(f"   ⚠️  {len(_planned)} writes exceed GitHub's {WRITES_PER_HOUR}/hour content-creation limit")
+
+    read_time = sum(seconds for _, _, seconds in _sent)
+    p50 = read_time + project_write_time(_planned, 50)
+    p95 = read_time + project_write_time(_planned, 95)
+    print(f"   Projected wall time: {_format_seconds(p50)} (p50) – {_format_seconds(p95)} (p95) "
+          f"at concurrency {concurrency_label()}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Record and replay GitHub API traffic ("cassettes").
+
+A cassette is a gzipped NDJSON file with one line per request/response
+exchange: method, URL, JSON body, status, a few response headers, the
+response text and how long the request took. Tokens never reach the file:
+request headers are not stored and any token seen in an Authorization header
+is replaced with <TOKEN> wherever it appears.
+
+Scripts use this through github_api's common options:
+    --record=FILE           Record every exchange to FILE.
+    --replay=FILE           Answer requests from FILE instead of the network.
+    --replay-speed=X        Replay timings scaled by X (1 = as recorded,
+                            2 = twice as fast, 0 = no delays; default 0).
+
+Replays match requests on method, URL (with query string) and JSON body, in
+recorded order. Once the recorded answers for a request are used up the last
+one is repeated, so retries and hedged duplicates replay cleanly.
+"""
+
+import gzip
+import json
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+SCRUBBED = "<TOKEN>"
+
+# Response headers the scripts (and their transport) rely on
+KEPT_HEADERS = [
+    "Content-Type", "Link", "ETag", "Last-Modified", "X-Poll-Interval", "Retry-After",
+    "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "X-RateLimit-Used",
+]
+
+
+def request_key(method, url, params=None, body=None):
+    """Return the (method, full URL, canonical body) a request is matched on."""
+    full_url = requests.Request(method, url, params=params).prepare().url
+    return method, full_url, json.dumps(body, sort_keys=True) if body is not None else None
+
+
+class Recorder:
+    """Transport that sends requests for real and records each exchange."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = gzip.open(path, "wt")
+        self.lock = threading.Lock()
+        self.tokens = set()
+        self.count = 0
+
+    def scrub(self, text):
+        for token in self.tokens:
+            text = text.replace(token, SCRUBBED)
+        return text
+
+    def __call__(self, method, url, **kwargs):
+        authorization = (kwargs.get("headers") or {}).get("Authorization", "")
+        if " " in authorization:
+            self.tokens.add(authorization.split(" ", 1)[1])
+
+        start = time.perf_counter()
+        response = requests.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - start
+        if self.file.closed:
+            return response  # Late requests (e.g. at exit) are sent but not recorded
+
+        method, full_url, body = request_key(method, url, kwargs.get("params"), kwargs.get("json"))
+        exchange = {
+            "method": method,
+            "url": self.scrub(full_url),
+            "body": self.scrub(body) if body is not None else None,
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            "response": self.scrub(response.text),
+            "elapsed": round(elapsed, 4),
+        }
+        with self.lock:
+            self.file.write(json.dumps(exchange, separators=(",", ":")) + "\n")
+            self.count += 1
+        return response
+
+    def close(self):
+        self.file.close()
+        print(f"📼 Recorded {self.count} exchanges to {self.path}")
+
+
+class Player:
+    """Transport that answers requests from a recorded cassette."""
+
+    def __init__(self, path, speed=0):
+        self.path = path
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.exchanges = {}
+        self.replayed = 0
+        with gzip.open(path, "rt") as f:
+            for line in f:
+                exchange = json.loads(line)
+                key = (exchange["method"], exchange["url"], exchange["body"])
+                self.exchanges.setdefault(key, []).append(exchange)
+
+    def __call__(self, method, url, **kwargs):
+        method, full_url, body = request_key(method, url, kwargs.get("params"), kwargs.get("json"))
+        for token in _tokens(kwargs.get("headers")):
+            full_url = full_url.replace(token, SCRUBBED)
+            body = body.replace(token, SCRUBBED) if body is not None else None
+
+        with self.lock:
+            recorded = self.exchanges.get((method, full_url, body))
+            if not recorded:
+                raise LookupError(f"No recorded exchange for {method} {full_url} in {self.path}")
+            exchange = recorded.pop(0) if len(recorded) > 1 else recorded[0]
+            self.replayed += 1
+
+        if self.speed:
+            time.sleep(exchange["elapsed"] / self.speed)
+        return build_response(exchange)
+
+    def close(self):
+        print(f"📼 Replayed {self.replayed} exchanges from {self.path}")
+
+
+def _tokens(headers):
+    authorization = (headers or {}).get("Authorization", "")
+    return [authorization.split(" ", 1)[1]] if " " in authorization else []
+
+
+def build_response(exchange):
+    """Build a requests.Response from a recorded (or forwarded) exchange."""
+    response = requests.Response()
+    response.status_code = exchange["status"]
+    response.url = exchange["url"]
+    response.headers = CaseInsensitiveDict(exchange["headers"])
+    response.encoding = "utf-8"
+    response._content = exchange["response"].encode("utf-8")
+    return response
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Optional local daemon that keeps warm GitHub connections, caches and quota.
+Usage: python scripts/github_daemon.py [--socket=PATH]
+       python scripts/github_daemon.py --status [--socket=PATH]
+
+The daemon listens on a Unix socket (default ~/.cache/mallocra-github/daemon.sock)
+and sends the scripts' requests on their behalf. It holds:
+- one pooled HTTP session, so connections stay open between script runs
+- a cache of GET responses revalidated with ETags; 304 answers cost no
+  rate-limit quota and carry no body
+- a rate-limit ledger per token and rate-limit resource (core, graphql,
+  search...) shared by every client, which holds requests back until the
+  reset time once that quota is exhausted
+
+Scripts use it with --daemon (or --daemon=PATH). If the daemon is not running
+they fall back to sending requests directly.
+
+The protocol is one JSON object per line in each direction. Requests are
+{"op": "request", "method", "url", "params", "json", "headers", "timeout"} or
+{"op": "status"}; responses mirror a cassette exchange
+({"status", "url", "headers", "response", "elapsed"}) or carry an "error".
+"""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from github_cassette import build_response
+
+DEFAULT_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "mallocra-github", "daemon.sock")
+MAX_CACHE_ENTRIES = 2000
+POOL_SIZE = 32
+
+# The body is forwarded decoded, so these no longer describe it
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class DaemonState:
+    """Shared session, response cache and rate-limit ledger."""
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # (token hash, full URL) -> exchange with ETag
+        self.ledger = {}            # (token hash, resource) -> {"limit", "remaining", "reset"}
+        self.requests = 0
+        self.cache_hits = 0
+        self.started = time.time()
+
+    def handle(self, message):
+        if message.get("op") == "status":
+            return self.status()
+        try:
+            return self.forward(message)
+        except requests.Timeout as e:
+            return {"error": "timeout", "message": str(e)}
+        except requests.RequestException as e:
+            return {"error": "connection", "message": str(e)}
+
+    def forward(self, message):
+        method = message["method"]
+        headers = dict(message.get("headers") or {})
+        token_key = hashlib.sha256(headers.get("Authorization", "").encode()).hexdigest()
+        timeout = message.get("timeout")
+        timeout = tuple(timeout) if isinstance(timeout, list) else timeout
+
+        cache_key = None
+        cached = None
+        # Requests that already carry their own validators are passed through
+        if method == "GET" and "If-None-Match" not in headers:
+            full_url = requests.Request("GET", message["url"], params=message.get("params")).prepare().url
+            cache_key = (token_key, full_url)
+            with self.lock:
+                cached = self.cache.get(cache_key)
+                if cached:
+                    self.cache.move_to_end(cache_key)
+            if cached:
+                headers["If-None-Match"] = cached["headers"]["ETag"]
+
+        resource = rate_limit_resource(message["url"])
+        self.wait_for_quota((token_key, resource))
+        start = time.perf_counter()
+        response = self.session.request(method, message["url"], params=message.get("params"),
+                                        json=message.get("json"), headers=headers, timeout=timeout)
+        elapsed = time.perf_counter() - start
+        self.update_ledger(token_key, resource, response.headers)
+
+        with self.lock:
+            self.requests += 1
+            if response.status_code == 304 and cached:
+                self.cache_hits += 1
+                return dict(cached, elapsed=elapsed)
+
+        exchange = {
+            "status": response.status_code,
+            "url": response.url,
+            "headers": {name: value for name, value in response.headers.items()
+                        if name.lower() not in DROPPED_HEADERS},
+            "response": response.text,
+            "elapsed": elapsed,
+        }
+        if cache_key and response.status_code == 200 and "ETag" in response.headers:
+            with self.lock:
+                self.cache[cache_key] = exchange
+                self.cache.move_to_end(cache_key)
+                while len(self.cache) > MAX_CACHE_ENTRIES:
+                    self.cache.popitem(last=False)
+        return exchange
+
+    def wait_for_quota(self, ledger_key):
+        """Block while this token's quota for a resource is exhausted, until it resets."""
+        with self.lock:
+            entry = self.ledger.get(ledger_key)
+            wait = entry["reset"] - time.time() + 1 if entry and entry["remaining"] <= 0 else 0
+        if wait > 0:
+            print(f"⏳ {ledger_key[1]} rate limit exhausted, holding requests for {wait:.0f}s")
+            time.sleep(wait)
+
+    def update_ledger(self, token_key, resource, headers):
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        # GitHub names the bucket it charged; trust that over the URL guess
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self.lock:
+            self.ledger[(token_key, resource)] = {
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "reset": int(headers.get("X-RateLimit-Reset", 0)),
+            }
+
+    def status(self):
+        with self.lock:
+            return {
+                "uptime": round(time.time() - self.started),
+                "requests": self.requests,
+                "cache_entries": len(self.cache),
+                "cache_hits": self.cache_hits,
+                "ledger": {f"{token_key[:8]}/{resource}": dict(entry)
+                           for (token_key, resource), entry in self.ledger.items()},
+            }
+
+
+def rate_limit_resource(url):
+    """Guess which rate-limit bucket GitHub will charge a request to."""
+    path = url.split("?")[0]
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """Serve one client connection, one JSON message per line."""
+
+    def handle(self):
+        for line in self.rfile:
+            reply = self.server.state.handle(json.loads(line))
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        self.state = DaemonState()
+        super().__init__(path, DaemonHandler)
+
+
+class DaemonClient:
+    """github_api transport that forwards requests to a running daemon."""
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.path = path
+        self.local = threading.local()
+
+    def _file(self):
+        if getattr(self.local, "file", None) is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.path)
+            self.local.file = sock.makefile("rwb")
+        return self.local.file
+
+    def send(self, message):
+        try:
+            f = self._file()
+            f.write(json.dumps(message).encode() + b"\n")
+            f.flush()
+            line = f.readline()
+        except OSError as e:
+            self.local.file = None
+            raise requests.ConnectionError(f"GitHub daemon unavailable: {e}")
+        if not line:
+            self.local.file = None
+            raise requests.ConnectionError("GitHub daemon closed the connection")
+        return json.loads(line)
+
+    def __call__(self, method, url, **kwargs):
+        reply = self.send({
+            "op": "request",
+            "method": method,
+            "url": url,
+            "params": kwargs.get("params"),
+            "json": kwargs.get("json"),
+            "headers": kwargs.get("headers") or {},
+            "timeout": kwargs.get("timeout"),
+        })
+        if reply.get("error") == "timeout":
+            raise requests.Timeout(reply["message"])
+        if reply.get("error"):
+            raise requests.ConnectionError(reply["message"])
+        return build_response(reply)
+
+    def is_running(self):
+        try:
+            self.send({"op": "status"})
+            return True
+        except requests.ConnectionError:
+            return False
+
+    def close(self):
+        pass
+
+
+def main():
+    path = DEFAULT_SOCKET
+    for arg in sys.argv[1:]:
+        if arg.startswith("--socket="):
+            path = arg.split("=", 1)[1]
+
+    if "--status" in sys.argv:
+        client = DaemonClient(path)
+        try:
+            print(json.dumps(client.send({"op": "status"}), indent=2))
+        except requests.ConnectionError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
+    if DaemonClient(path).is_running():
+        print(f"Daemon already running on {path}")
+        sys.exit(1)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)  # Stale socket from a daemon that did not shut down cleanly
+
+    # Create the socket owner-only from the start rather than chmod-ing it after bind
+    previous_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(path)
+    finally:
+        os.umask(previous_umask)
+    print(f"🚀 GitHub daemon listening on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
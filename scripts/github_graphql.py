@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+GraphQL read path for issues and milestones.
+
+The REST issues endpoint returns ~5 KB per issue (user, reactions, URLs, full
+body) while the scripts only use number, title, state, milestone and labels.
+These queries select just those fields, page with cursors and return records
+shaped like the REST ones, so callers can switch backends transparently:
+
+    issue:     {"number", "title", "state", "milestone": {"number", "title"} | None,
+                "labels": [{"name"}]}
+    milestone: {"number", "title", "description", "state", "due_on",
+                "open_issues", "closed_issues"}
+
+Pull requests are not part of repository.issues, so no filtering is needed.
+"""
+
+import github_api
+
+STATES = {
+    "open": ["OPEN"],
+    "closed": ["CLOSED"],
+    "all": ["OPEN", "CLOSED"],
+}
+
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $states: [IssueState!], $labels: [String!], $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $after, states: $states, labels: $labels) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        state
+        milestone { number title }
+        labels(first: 50) { nodes { name } }
+      }
+    }
+  }
+}
+"""
+
+MILESTONES_QUERY = """
+query($owner: String!, $name: String!, $states: [MilestoneState!], $after: String) {
+  repository(owner: $owner, name: $name) {
+    milestones(first: 100, after: $after, states: $states) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        description
+        state
+        dueOn
+        openIssues: issues(states: OPEN) { totalCount }
+        closedIssues: issues(states: CLOSED) { totalCount }
+        openPullRequests: pullRequests(states: OPEN) { totalCount }
+        closedPullRequests: pullRequests(states: [CLOSED, MERGED]) { totalCount }
+      }
+    }
+  }
+}
+"""
+
+
+def run_query(token, query, variables):
+    """Run a GraphQL query and return its data, or None on error."""
+    headers = {
+        "Authorization": f"bearer {token}",
+        "Accept-Encoding": "gzip",
+    }
+
+    response = github_api.post(github_api.GRAPHQL_URL, headers=headers, json={"query": query, "variables": variables})
+
+    if response.status_code != 200:
+        print(f"Error: {response.text}")
+        return None
+    result = github_api.decode(response)
+    if result.get("errors"):
+        print(f"Error: {result['errors']}")
+        return None
+    return result["data"]
+
+
+def _iter_nodes(token, query, variables, connection):
+    """Yield the nodes of a repository connection, following cursors."""
+    after = None
+    while True:
+        data = run_query(token, query, dict(variables, after=after))
+        if data is None:
+            raise RuntimeError(f"GraphQL query for {connection} failed")
+        page = data["repository"][connection]
+        yield from page["nodes"]
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        after = page["pageInfo"]["endCursor"]
+
+
+def iter_issues(token, repo_owner, repo_name, state="open", labels=None):
+    """Yield REST-shaped issues. Like REST, every label in labels must match."""
+    labels = [label for label in (labels or []) if label]
+    variables = {
+        "owner": repo_owner,
+        "name": repo_name,
+        "states": STATES[state],
+        # GraphQL label filters match ANY label; narrow server-side on the
+        # first one and check the rest here to keep REST's ALL semantics.
+        "labels": labels[:1] or None,
+    }
+    wanted = {label.lower() for label in labels}
+
+    for node in _iter_nodes(token, ISSUES_QUERY, variables, "issues"):
+        names = [label["name"] for label in node["labels"]["nodes"]]
+        if wanted - {name.lower() for name in names}:
+            continue
+        yield {
+            "number": node["number"],
+            "title": node["title"],
+            "state": node["state"].lower(),
+            "milestone": node["milestone"],
+            "labels": [{"name": name} for name in names],
+        }
+
+
+def get_issues(token, repo_owner, repo_name, state="open", labels=None):
+    """Get all issues as a list, or [] on error."""
+    try:
+        return list(iter_issues(token, repo_owner, repo_name, state, labels))
+    except RuntimeError:
+        print(f"❌ Failed to get issues")
+        return []
+
+
+def get_milestones(token, repo_owner, repo_name, state="open"):
+    """Get all milestones (with issue counts) as a list, or None on error."""
+    variables = {
+        "owner": repo_owner,
+        "name": repo_name,
+        "states": STATES[state],
+    }
+
+    try:
+        return [{
+            "number": node["number"],
+            "title": node["title"],
+            "description": node["description"],
+            "state": node["state"].lower(),
+            "due_on": node["dueOn"],
+            # Like REST, the counts include pull requests
+            "open_issues": node["openIssues"]["totalCount"] + node["openPullRequests"]["totalCount"],
+            "closed_issues": node["closedIssues"]["totalCount"] + node["closedPullRequests"]["totalCount"],
+        } for node in _iter_nodes(token, MILESTONES_QUERY, variables, "milestones")]
+    except RuntimeError:
+        print(f"❌ Failed to get milestones")
+        return None
@@ -9,12 +9,30 @@ Prerequisites:
 
 Usage:
 export GITHUB_TOKEN=your_token_here
-python scripts/github_issues.py
+python scripts/github_issues.py [--plan] [--subtask-issues] [--concurrency=N]
+
+The backlog is parsed as a stream: each task is handed to a bounded queue as
+soon as it is read, and a pool of workers creates the issues while parsing
+continues. The `area: <section>` labels are created before the first task of
+their section is queued. With --subtask-issues every subtask also becomes its
+own issue, created only after its parent so it can link to it.
+
+Before anything is created, every existing issue (open and closed) is fetched
+once and indexed by normalized title (see issue_index.py). Tasks whose title
+matches an existing issue exactly, or closely enough to be a near-duplicate,
+are reported and skipped; with --graphql the issues are fetched through the
+lighter GraphQL query.
 """
 
 import os
-import re
+import queue
+import sys
+import threading
+import time
+import github_api
+import github_graphql
 import requests
+from issue_index import IssueIndex
 import markdown
 from bs4 import BeautifulSoup
 
@@ -23,112 +41,289 @@ REPO_OWNER = "your-username"  # Replace with your GitHub username
 REPO_NAME = "your-repo-name"  # Replace with your repository name
 BACKLOG_FILE = "docs/landing-page-backlog.md"
 GITHUB_API = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/issues"
-
-# Read GitHub token from environment variable
-token = os.environ.get("GITHUB_TOKEN")
-if not token:
-    print("Error: GITHUB_TOKEN environment variable not set.")
-    print("Create a token at https://github.com/settings/tokens and set it with:")
-    print("export GITHUB_TOKEN=your_token_here")
-    exit(1)
-
-# Read backlog file
-with open(BACKLOG_FILE, "r") as file:
-    backlog_content = file.read()
-
-# Parse the markdown to extract sections and tasks
-sections = []
-current_section = None
-tasks = []
-
-# Split content into lines
-lines = backlog_content.split("\n")
-i = 0
-
-while i < len(lines):
-    line = lines[i].strip()
-    
-    # Section headers (##)
-    if line.startswith("## "):
-        if current_section and tasks:
-            sections.append({
-                "title": current_section,
-                "tasks": tasks
-            })
-            tasks = []
-        
-        current_section = line[3:]
-    
-    # Task items (- [ ])
-    elif line.startswith("- [ ]"):
-        task_title = line[6:].strip()
-        task_description = ""
-        subtasks = []
-        
-        # Look ahead for subtasks
-        j = i + 1
-        while j < len(lines) and lines[j].strip().startswith("  - [ ]"):
-            subtask = lines[j].strip()[8:]
-            subtasks.append(subtask)
-            j += 1
-        
-        if subtasks:
-            task_description = "### Subtasks:\n\n" + "\n".join([f"- [ ] {task}" for task in subtasks])
-            i = j - 1
-        
-        tasks.append({
-            "title": task_title,
-            "description": task_description
-        })
-    
-    i += 1
-
-# Add the last section
-if current_section and tasks:
-    sections.append({
-        "title": current_section,
-        "tasks": tasks
-    })
-
-# Create issues on GitHub
-headers = {
-    "Authorization": f"token {token}",
-    "Accept": "application/vnd.github.v3+json"
-}
-
-print("Creating GitHub issues...")
+LABELS_API = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/labels"
+TITLE_TAG = "[Landing Page]"
+QUEUE_SIZE = 100
+LABEL_COLOR = "ededed"
+LABEL_RETRY_DELAY = 1  # seconds, doubled on each retry
 
 # Uncomment the following to actually create issues
 create_issues = False  # Set to True to create issues
 
-for section in sections:
-    print(f"\nSection: {section['title']}")
-    
-    for task in section['tasks']:
-        issue_title = f"[Landing Page] {task['title']}"
-        issue_body = f"Part of the Landing Page improvements.\n\n{task['description']}"
-        labels = ["landing-page", f"area: {section['title'].lower()}"]
-        
+def parse_backlog(lines):
+    """Yield a task for every open item ("- [ ]") under a "## " section.
+
+    Indented open items directly below a task are its subtasks.
+    """
+    current_section = None
+    i = 0
+
+    while i < len(lines):
+        line = lines[i].strip()
+
+        # Section headers (##)
+        if line.startswith("## "):
+            current_section = line[3:]
+
+        # Task items (- [ ])
+        elif line.startswith("- [ ]") and not lines[i].startswith(" ") and current_section:
+            subtasks = []
+
+            # Look ahead for subtasks
+            j = i + 1
+            while j < len(lines) and lines[j].startswith("  ") and lines[j].strip().startswith("- [ ]"):
+                subtasks.append(lines[j].strip()[6:].strip())
+                j += 1
+
+            task_description = ""
+            if subtasks:
+                task_description = "### Subtasks:\n\n" + "\n".join([f"- [ ] {task}" for task in subtasks])
+                i = j - 1
+
+            yield {
+                "section": current_section,
+                "title": line[6:].strip(),
+                "description": task_description,
+                "subtasks": subtasks
+            }
+
+        i += 1
+
+def task_labels(task):
+    return ["landing-page", f"area: {task['section'].lower()}"]
+
+def get_existing_labels(headers):
+    """Get the names (lowercased) of all labels already in the repository."""
+    try:
+        return {label["name"].lower() for page in github_api.iter_pages(LABELS_API, headers=headers) for label in page}
+    except (RuntimeError, requests.RequestException) as e:
+        print(f"⚠️  Could not list labels, creating them as needed: {e}")
+        return set()
+
+def ensure_label(name, headers, existing):
+    """Create a label unless it already exists.
+
+    Creating a label is safe to repeat (a second POST answers 422), so
+    timeouts, connection errors and 5xx responses are retried. A label that
+    still can't be created is reported once and the run carries on.
+    """
+    if name.lower() in existing:
+        return
+    for attempt in range(github_api.MAX_RETRIES + 1):
+        try:
+            response = github_api.post(LABELS_API, json={"name": name, "color": LABEL_COLOR}, headers=headers)
+        except requests.RequestException as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            # 422 means another run created it first
+            if response.status_code in (201, 422):
+                existing.add(name.lower())
+                return
+            error = f"{response.status_code} {response.text}"
+            if response.status_code < 500:
+                break
+        if attempt < github_api.MAX_RETRIES:
+            time.sleep(LABEL_RETRY_DELAY * 2 ** attempt)
+    print(f"\n  ✗ Failed to create label '{name}': {error}")
+    # Don't retry for every task; GitHub creates missing labels with the issue
+    existing.add(name.lower())
+
+def create_issue(issue_data, headers):
+    """Create an issue and return its number (None in plan mode), or False."""
+    try:
+        response = github_api.create(GITHUB_API, json=issue_data, headers=headers)
+    except (requests.RequestException, RuntimeError) as e:
+        # Raised once github_api's retries are exhausted
+        print(f"\n  ✗ Failed to create issue '{issue_data['title']}': {type(e).__name__}: {e}")
+        return False
+    if response.status_code == 201:
+        return response.json()["number"]
+    print(f"\n  ✗ Failed to create issue '{issue_data['title']}': {response.status_code}")
+    print(response.text)
+    return False
+
+def get_existing_issues(token, headers):
+    """Yield every issue in the repository, open and closed."""
+    if github_api.USE_GRAPHQL:
+        yield from github_graphql.iter_issues(token, REPO_OWNER, REPO_NAME, state="all")
+        return
+    for page in github_api.iter_pages(GITHUB_API, headers=headers, params={"state": "all"}):
+        # Filter out pull requests
+        yield from (issue for issue in page if "pull_request" not in issue)
+
+def claim_title(index, record, progress):
+    """Index a record about to be created; report and return the issue it duplicates, if any.
+
+    The caller fills in record["number"] once the issue exists.
+    """
+    with github_api.phase("plan"):
+        match = index.find_or_add(record)
+    if match is None:
+        return None
+    issue, similarity = match
+    existing = f"#{issue['number']}" if issue["number"] else "an issue from this run"
+    kind = "same title" if similarity == 1.0 else f"{similarity:.0%} similar"
+    print(f"\n  ↷ Skipping '{record['title']}': duplicate of {existing} '{issue['title']}' ({kind})")
+    progress.add(skipped=1)
+    return issue
+
+class Progress:
+    """Single live line with parse/create counts and throughput."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.parsed = 0
+        self.created = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def add(self, parsed=0, created=0, failed=0, skipped=0):
+        with self.lock:
+            self.parsed += parsed
+            self.created += created
+            self.failed += failed
+            self.skipped += skipped
+            rate = self.created / max(time.perf_counter() - self.started, 1e-6)
+            print(f"\r  parsed {self.parsed} | created {self.created} | failed {self.failed} | "
+                  f"skipped {self.skipped} | "
+                  f"{rate:.1f} issues/s | write concurrency {github_api.concurrency_label()}   ",
+                  end="", flush=True)
+
+def run_pipeline(tasks, headers, index, subtask_issues=False):
+    """Create issues for a stream of tasks with a pool of workers.
+
+    Titles found in index (existing issues) are skipped.
+    """
+    work = queue.Queue(maxsize=QUEUE_SIZE)
+    progress = Progress()
+
+    def create_task_issues(task):
         issue_data = {
-            "title": issue_title,
-            "body": issue_body,
-            "labels": labels
+            "title": f"{TITLE_TAG} {task['title']}",
+            "body": f"Part of the Landing Page improvements.\n\n{task['description']}",
+            "labels": task_labels(task)
         }
-        
-        print(f"Creating issue: {issue_title}")
-        
-        if create_issues:
-            response = requests.post(GITHUB_API, json=issue_data, headers=headers)
-            if response.status_code == 201:
-                print(f"  ✓ Created issue #{response.json()['number']}")
-            else:
-                print(f"  ✗ Failed to create issue: {response.status_code}")
-                print(response.json())
+        if task["duplicate_of"]:
+            number = task["duplicate_of"]["number"]
         else:
-            print("  (Dry run - not actually creating issue)")
+            number = create_issue(issue_data, headers)
+            task["record"]["number"] = number or None
+            progress.add(created=number is not False, failed=number is False)
+        if number is False or not subtask_issues:
+            return
+
+        # Subtasks are created after their parent so they can link to it
+        parent = f"#{number}" if number else f"\"{issue_data['title']}\""
+        for subtask in task["subtasks"]:
+            subtask_data = {
+                "title": f"{TITLE_TAG} {subtask}",
+                "body": f"Subtask of {parent}.",
+                "labels": task_labels(task)
+            }
+            record = {"title": subtask_data["title"], "number": None}
+            if claim_title(index, record, progress):
+                continue
+            subtask_number = create_issue(subtask_data, headers)
+            record["number"] = subtask_number or None
+            progress.add(created=subtask_number is not False, failed=subtask_number is False)
+
+    def worker():
+        while True:
+            task = work.get()
+            if task is None:
+                return
+            with github_api.phase("apply"):
+                create_task_issues(task)
+
+    workers = [threading.Thread(target=worker, daemon=True)
+               for _ in range(github_api.CONCURRENCY or github_api.MAX_CONCURRENCY)]
+    for thread in workers:
+        thread.start()
+
+    def put(item):
+        # Never block forever on a full queue if every worker has died
+        while True:
+            try:
+                work.put(item, timeout=1)
+                return
+            except queue.Full:
+                if not any(thread.is_alive() for thread in workers):
+                    raise RuntimeError("All issue creation workers stopped unexpectedly")
+
+    existing_labels = get_existing_labels(headers)
+    tasks = iter(tasks)
+    while True:
+        # Parsing happens lazily, as each task is pulled from the generator
+        with github_api.phase("plan"):
+            task = next(tasks, None)
+        if task is None:
+            break
+        progress.add(parsed=1)
+        # A duplicate task is still queued for its subtasks, which link to the existing issue
+        task["record"] = {"title": f"{TITLE_TAG} {task['title']}", "number": None}
+        task["duplicate_of"] = claim_title(index, task["record"], progress)
+        if task["duplicate_of"] and not (subtask_issues and task["subtasks"]):
+            continue
+        # Labels exist before any worker can use them
+        for label in task_labels(task):
+            ensure_label(label, headers, existing_labels)
+        put(task)
+
+    for _ in workers:
+        put(None)
+    for thread in workers:
+        thread.join()
+    print()
+    return progress
+
+def main():
+    github_api.configure_from_argv()
+    subtask_issues = "--subtask-issues" in sys.argv
+
+    # Read GitHub token from environment variable
+    token = os.environ.get("GITHUB_TOKEN")
+    if not token:
+        print("Error: GITHUB_TOKEN environment variable not set.")
+        print("Create a token at https://github.com/settings/tokens and set it with:")
+        print("export GITHUB_TOKEN=your_token_here")
+        exit(1)
+
+    if not create_issues:
+        github_api.enable_plan_mode()
+
+    headers = {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+
+    print("Indexing existing issues...")
+    try:
+        with github_api.phase("plan"):
+            index = IssueIndex(get_existing_issues(token, headers), strip_tag=TITLE_TAG)
+    except RuntimeError as e:
+        print(f"❌ Failed to get existing issues")
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Indexed {len(index)} existing issue titles.")
+
+    print("Creating GitHub issues...")
+
+    # Read backlog file
+    with open(BACKLOG_FILE, "r") as file:
+        progress = run_pipeline(parse_backlog(file.read().split("\n")), headers, index, subtask_issues)
+
+    print(f"Done: {progress.created} issues created, {progress.skipped} duplicates skipped, {progress.failed} failed "
+          f"in {time.perf_counter() - progress.started:.1f}s")
+
+    if not github_api.PLAN_MODE:
+        return
+
+    print("\nTo actually create the issues:")
+    print("1. Set GITHUB_TOKEN environment variable")
+    print("2. Update REPO_OWNER and REPO_NAME in the script")
+    print("3. Set create_issues = True in the script")
+    print("4. Run: python scripts/github_issues.py")
 
-print("\nTo actually create the issues:")
-print("1. Set GITHUB_TOKEN environment variable")
-print("2. Update REPO_OWNER and REPO_NAME in the script")
-print("3. Set create_issues = True in the script")
-print("4. Run: python scripts/github_issues.py") 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Phase-level profiling for the GitHub scripts.
+
+Scripts use this through github_api's common options:
+    --profile[=FILE]    Time each phase of the run and write a JSON report to
+                        FILE (default <script>-profile.json).
+    --cprofile=FILE     Also record a cProfile of the main thread to FILE
+                        (read it with `python -m pstats FILE`).
+
+Phases are marked with github_api.phase(name):
+    fetch     waiting for GitHub, on the thread that needs the response
+    decode    parsing JSON response pages
+    plan      client-side work: parsing the backlog, filtering and matching
+    apply     carrying out writes, including waits for the write limiter
+
+Wall and CPU time are measured per thread and are exclusive: a fetch inside
+a plan phase is counted as fetch only. Work in worker threads is counted
+alongside the main thread, so phase totals can exceed the run's wall time.
+Peak memory is the highest tracemalloc allocation above the level at which
+each phase started; phases running concurrently share one tracemalloc peak,
+so their figures are approximate.
+
+To compare two reports:
+    python scripts/github_profile.py before.json after.json
+"""
+
+import cProfile
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Profiler:
+    """Accumulate wall/CPU time and peak memory for each named phase."""
+
+    def __init__(self, report_path, cprofile_path=None):
+        self.report_path = report_path
+        self.cprofile_path = cprofile_path
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.phases = {}  # name -> {"calls", "wall_seconds", "cpu_seconds", "peak_bytes"}
+        self.peak_bytes = 0
+        self.cprofile = cProfile.Profile() if cprofile_path else None
+
+    def start(self):
+        # Create output directories up front rather than failing after the run
+        for path in (self.report_path, self.cprofile_path):
+            if path:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.started = time.time()
+        self.started_wall = time.perf_counter()
+        self.started_cpu = time.process_time()
+        tracemalloc.start()
+        if self.cprofile:
+            self.cprofile.enable()
+
+    @contextmanager
+    def phase(self, name):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        if stack:
+            self._charge(stack[-1])
+        current = tracemalloc.get_traced_memory()[0]
+        self._reset_peak()
+        entry = {"name": name, "wall": time.perf_counter(), "cpu": time.thread_time(), "memory": current}
+        stack.append(entry)
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._charge(entry, calls=1)
+            if stack:
+                stack[-1]["wall"] = time.perf_counter()
+                stack[-1]["cpu"] = time.thread_time()
+
+    def _charge(self, entry, calls=0):
+        """Add the time since entry was (re)started to its phase."""
+        wall = time.perf_counter() - entry["wall"]
+        cpu = time.thread_time() - entry["cpu"]
+        peak = tracemalloc.get_traced_memory()[1] - entry["memory"]
+        with self.lock:
+            totals = self.phases.setdefault(entry["name"], {
+                "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_bytes": 0})
+            totals["calls"] += calls
+            totals["wall_seconds"] += wall
+            totals["cpu_seconds"] += cpu
+            totals["peak_bytes"] = max(totals["peak_bytes"], peak)
+
+    def _reset_peak(self):
+        # Keep the run-wide peak before a phase resets tracemalloc's
+        with self.lock:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+    def report(self):
+        with self.lock:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            return {
+                "script": os.path.basename(sys.argv[0]),
+                "version": _git_version(),
+                "python": sys.version.split()[0],
+                "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+                "wall_seconds": round(time.perf_counter() - self.started_wall, 4),
+                "cpu_seconds": round(time.process_time() - self.started_cpu, 4),
+                "peak_memory_kib": round(self.peak_bytes / 1024, 1),
+                "phases": {
+                    name: {
+                        "calls": totals["calls"],
+                        "wall_seconds": round(totals["wall_seconds"], 4),
+                        "cpu_seconds": round(totals["cpu_seconds"], 4),
+                        "peak_memory_kib": round(totals["peak_bytes"] / 1024, 1),
+                    }
+                    for name, totals in sorted(self.phases.items())
+                },
+            }
+
+    def stop(self):
+        if self.cprofile:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_path)
+        report = self.report()
+        tracemalloc.stop()
+        with open(self.report_path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+        print(f"\n⏱️  Profile ({report['wall_seconds']:.2f}s wall, {report['cpu_seconds']:.2f}s CPU, "
+              f"peak {report['peak_memory_kib']:.0f} KiB)")
+        for name, phase in report["phases"].items():
+            print(f"   {name:<8} {phase['calls']:>6} calls  {phase['wall_seconds']:>8.3f}s wall  "
+                  f"{phase['cpu_seconds']:>8.3f}s CPU  {phase['peak_memory_kib']:>9.0f} KiB peak")
+        print(f"   Report written to {self.report_path}")
+        if self.cprofile:
+            print(f"   cProfile written to {self.cprofile_path}")
+
+
+def _git_version():
+    try:
+        result = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(before, after):
+    """Print per-phase changes between two reports."""
+    print(f"{before['script']} {before['version']} → {after['script']} {after['version']}")
+    rows = [("total", before, after)]
+    for name in sorted(set(before["phases"]) | set(after["phases"])):
+        rows.append((name, before["phases"].get(name, {}), after["phases"].get(name, {})))
+
+    for name, old, new in rows:
+        changes = []
+        for key, unit in (("wall_seconds", "s wall"), ("cpu_seconds", "s CPU"), ("peak_memory_kib", " KiB")):
+            old_value, new_value = old.get(key, 0), new.get(key, 0)
+            percent = f" ({(new_value - old_value) / old_value:+.0%})" if old_value else ""
+            changes.append(f"{old_value:g} → {new_value:g}{unit}{percent}")
+        print(f"  {name:<8} " + " | ".join(changes))
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python scripts/github_profile.py <before.json> <after.json>")
+        sys.exit(1)
+    with open(sys.argv[1], "r") as f:
+        before = json.load(f)
+    with open(sys.argv[2], "r") as f:
+        after = json.load(f)
+    compare(before, after)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+In-memory title index for spotting issues that already exist.
+
+Titles are normalized before comparison: lowercased and punctuation
+collapsed to single spaces. An index can also be given the tag its caller
+prefixes titles with, which is dropped so that with strip_tag="[Landing Page]"
+"[Landing Page] Add hero search!" and "add hero search" are the same title.
+Other tags are kept: "[Activities Page] Add hero search" is a different
+area's task, not a duplicate.
+
+    index = IssueIndex(existing_issues, strip_tag="[Landing Page]")
+    match = index.find("[Landing Page] Add hero search bar")
+    # -> (issue, 1.0) for an exact normalized match,
+    #    (issue, 0.83) for a near-duplicate, or None
+
+Exact matches are a single dict lookup. Near-duplicates are titles whose
+token sets have a Jaccard similarity of at least the threshold. They are
+found through an inverted index with prefix filtering: if J(x, y) >= t then
+y holds at least ceil(t * |x|) of x's tokens, so it must contain one of
+any |x| - ceil(t * |x|) + 1 of them. Only the postings of that many of the
+title's rarest tokens are read, and only those candidates are scored, so a
+lookup stays cheap however many issues are indexed.
+"""
+
+import math
+import re
+import threading
+from collections import defaultdict
+
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_title(title, strip_tag=None):
+    """Return the form titles are compared in, without a leading strip_tag."""
+    title = title.lower().strip()
+    if strip_tag and title.startswith(strip_tag.lower()):
+        title = title[len(strip_tag):]
+    return NON_WORD_PATTERN.sub(" ", title).strip()
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class IssueIndex:
+    """Exact and near-duplicate title lookups over a set of issues."""
+
+    def __init__(self, issues=(), threshold=NEAR_DUPLICATE_THRESHOLD, strip_tag=None):
+        self.threshold = threshold
+        self.strip_tag = strip_tag
+        self.lock = threading.RLock()
+        self.by_title = {}                 # normalized title -> issue
+        self.tokens = []                   # entry id -> (token set, issue)
+        self.postings = defaultdict(list)  # token -> entry ids
+        for issue in issues:
+            self.add(issue)
+
+    def __len__(self):
+        return len(self.by_title)
+
+    def add(self, issue):
+        """Index an issue (any dict with a "title")."""
+        title = normalize_title(issue["title"], self.strip_tag)
+        tokens = frozenset(title.split())
+        with self.lock:
+            if title in self.by_title:
+                return
+            self.by_title[title] = issue
+            entry = len(self.tokens)
+            self.tokens.append((tokens, issue))
+            for token in tokens:
+                self.postings[token].append(entry)
+
+    def find(self, title):
+        """Return (issue, similarity) for the closest indexed title, or None."""
+        title = normalize_title(title, self.strip_tag)
+        with self.lock:
+            if title in self.by_title:
+                return self.by_title[title], 1.0
+
+            tokens = frozenset(title.split())
+            if not tokens:
+                return None
+            prefix_size = len(tokens) - math.ceil(self.threshold * len(tokens) - 1e-9) + 1
+            rarest = sorted(tokens, key=lambda token: len(self.postings.get(token, ())))[:prefix_size]
+            candidates = {entry for token in rarest for entry in self.postings.get(token, ())}
+
+            best = None
+            for entry in candidates:
+                other, issue = self.tokens[entry]
+                similarity = jaccard(tokens, other)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (issue, similarity)
+            return best
+
+    def find_or_add(self, issue):
+        """Return the match for an issue's title, indexing the issue if there is none."""
+        with self.lock:
+            match = self.find(issue["title"])
+            if match is None:
+                self.add(issue)
+            return match
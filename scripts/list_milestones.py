@@ -1,28 +1,51 @@
 #!/usr/bin/env python3
 """
 Script to list GitHub milestones for the project.
-Usage: python scripts/list_milestones.py <github_token>
+Usage: python scripts/list_milestones.py <github_token> [--graphql] [--watch[=SECONDS]]
+
+With --watch the script keeps polling (open and closed) milestones and prints
+only what changed: new, closed, reopened, renamed or deleted milestones,
+open/closed issue count deltas and due-date changes. Polls use conditional
+requests, so unchanged data comes back as 304 Not Modified without using
+rate-limit quota. The poll interval is the larger of SECONDS (default 60) and
+the server's X-Poll-Interval.
 """
 
 import sys
-import requests
+import time
+import github_api
+import github_graphql
 import json
+import requests
 from datetime import datetime
 
-def list_milestones(token, repo_owner, repo_name, state="open"):
-    """List GitHub milestones."""
+DEFAULT_POLL_INTERVAL = 60
+
+def fetch_milestones(token, repo_owner, repo_name, state="open"):
+    """Fetch GitHub milestones, or None on error."""
+    if github_api.USE_GRAPHQL:
+        return github_graphql.get_milestones(token, repo_owner, repo_name, state)
+
     url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/milestones?state={state}"
     headers = {
         "Accept": "application/vnd.github.v3+json",
         "Authorization": f"token {token}"
     }
     
-    print(f"Listing {state} milestones for {repo_owner}/{repo_name}...")
-    response = requests.get(url, headers=headers)
+    response = github_api.get(url, headers=headers)
     
     if response.status_code == 200:
-        milestones = response.json()
-        
+        return github_api.decode(response)
+    else:
+        print(f"Error: {response.text}")
+        return None
+
+def list_milestones(token, repo_owner, repo_name, state="open"):
+    """List GitHub milestones."""
+    print(f"Listing {state} milestones for {repo_owner}/{repo_name}...")
+    milestones = fetch_milestones(token, repo_owner, repo_name, state)
+    
+    if milestones is not None:
         if not milestones:
             print(f"No {state} milestones found.")
             return []
@@ -33,11 +56,7 @@ def list_milestones(token, repo_owner, repo_name, state="open"):
             print(f"   Description: {milestone['description']}")
             print(f"   State: {milestone['state']}")
             
-            if milestone['due_on']:
-                due_date = datetime.fromisoformat(milestone['due_on'].replace('Z', '+00:00'))
-                print(f"   Due: {due_date.strftime('%Y-%m-%d')}")
-            else:
-                print("   Due: No due date")
+            print(f"   Due: {format_due(milestone['due_on'])}")
                 
             print(f"   Open issues: {milestone['open_issues']}")
             print(f"   Closed issues: {milestone['closed_issues']}")
@@ -45,18 +64,141 @@ def list_milestones(token, repo_owner, repo_name, state="open"):
         return milestones
     else:
         print(f"❌ Failed to list milestones")
-        print(f"Error: {response.text}")
         return None
 
+def format_due(due_on):
+    if not due_on:
+        return "No due date"
+    return datetime.fromisoformat(due_on.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+
+def fetch_milestones_conditional(token, repo_owner, repo_name, cache):
+    """Fetch all milestones using conditional requests.
+    
+    cache maps each page URL to (etag, milestones, next page URL). It is
+    updated in place once every page has been fetched, so a failed poll
+    leaves it untouched and the next poll still sees the changes. Returns (milestones, changed, poll interval), or
+    (None, False, None) on error.
+    """
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/milestones?state=all&per_page=100"
+    milestones = []
+    fetched = {}
+    poll_interval = 0
+    
+    while url:
+        headers = {
+            "Accept": "application/vnd.github.v3+json",
+            "Authorization": f"token {token}"
+        }
+        if url in cache:
+            headers["If-None-Match"] = cache[url][0]
+        
+        response = github_api.get(url, headers=headers)
+        
+        if response.status_code == 304:
+            etag, page, next_url = cache[url]
+        elif response.status_code == 200:
+            page = github_api.decode(response)
+            next_url = response.links.get("next", {}).get("url")
+            fetched[url] = (response.headers.get("ETag"), page, next_url)
+        else:
+            print(f"Error: {response.text}")
+            return None, False, None
+        
+        poll_interval = max(poll_interval, int(response.headers.get("X-Poll-Interval", 0)))
+        milestones.extend(page)
+        url = next_url
+    
+    cache.update(fetched)
+    return milestones, bool(fetched), poll_interval
+
+def describe_changes(previous, current):
+    """Return a line for every difference between two milestone snapshots."""
+    changes = []
+    for number, milestone in current.items():
+        title = milestone["title"]
+        old = previous.get(number)
+        if old is None:
+            changes.append(f"🆕 New milestone: {title} (#{number}), due: {format_due(milestone['due_on'])}")
+            continue
+        if old["title"] != title:
+            changes.append(f"✏️  Renamed: {old['title']} → {title} (#{number})")
+        if old["state"] != milestone["state"]:
+            changes.append(f"✅ Closed: {title}" if milestone["state"] == "closed" else f"🔄 Reopened: {title}")
+        if old["due_on"] != milestone["due_on"]:
+            changes.append(f"📅 {title}: due {format_due(old['due_on'])} → {format_due(milestone['due_on'])}")
+        if (old["open_issues"], old["closed_issues"]) != (milestone["open_issues"], milestone["closed_issues"]):
+            open_delta = milestone["open_issues"] - old["open_issues"]
+            closed_delta = milestone["closed_issues"] - old["closed_issues"]
+            changes.append(f"📊 {title}: open {old['open_issues']} → {milestone['open_issues']} ({open_delta:+d}), "
+                           f"closed {old['closed_issues']} → {milestone['closed_issues']} ({closed_delta:+d})")
+    for number, milestone in previous.items():
+        if number not in current:
+            changes.append(f"🗑️  Deleted: {milestone['title']} (#{number})")
+    return changes
+
+def watch_milestones(token, repo_owner, repo_name, interval=DEFAULT_POLL_INTERVAL):
+    """Poll milestones forever, printing only the changes."""
+    print(f"Watching milestones for {repo_owner}/{repo_name} (Ctrl+C to stop)...")
+    cache = {}
+    snapshot = None
+    
+    while True:
+        try:
+            milestones, changed, poll_interval = fetch_milestones_conditional(token, repo_owner, repo_name, cache)
+            error = None
+        except requests.RequestException as e:
+            # Timeouts and connection errors survive github_api's retries; keep watching
+            milestones, changed, poll_interval = None, False, 0
+            error = type(e).__name__
+        stamp = datetime.now().strftime("%H:%M:%S")
+        
+        if milestones is None:
+            reason = f" ({error})" if error else ""
+            print(f"[{stamp}] ❌ Failed to poll milestones{reason}, retrying next interval")
+            poll_interval = 0
+        elif snapshot is None:
+            snapshot = {milestone["number"]: milestone for milestone in milestones}
+            open_count = sum(1 for milestone in milestones if milestone["state"] == "open")
+            print(f"[{stamp}] {open_count} open, {len(milestones) - open_count} closed milestones")
+            for milestone in milestones:
+                if milestone["state"] == "open":
+                    print(f"   📊 {milestone['title']} (#{milestone['number']}): {milestone['open_issues']} open, "
+                          f"{milestone['closed_issues']} closed, due: {format_due(milestone['due_on'])}")
+        elif changed:
+            current = {milestone["number"]: milestone for milestone in milestones}
+            for line in describe_changes(snapshot, current):
+                print(f"[{stamp}] {line}")
+            snapshot = current
+        
+        time.sleep(max(interval, poll_interval))
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python scripts/list_milestones.py <github_token>")
+    github_api.configure_from_argv()
+    watch_interval = None
+    args = []
+    for arg in sys.argv[1:]:
+        if arg == "--watch":
+            watch_interval = DEFAULT_POLL_INTERVAL
+        elif arg.startswith("--watch="):
+            watch_interval = int(arg.split("=", 1)[1])
+        else:
+            args.append(arg)
+    
+    if len(args) != 1:
+        print("Usage: python scripts/list_milestones.py <github_token> [--graphql] [--watch[=SECONDS]]")
         sys.exit(1)
     
-    token = sys.argv[1]
+    token = args[0]
     repo_owner = "samsiso"
     repo_name = "mallocra-activities"
     
+    if watch_interval is not None:
+        try:
+            watch_milestones(token, repo_owner, repo_name, watch_interval)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        return
+    
     # List open milestones
     open_milestones = list_milestones(token, repo_owner, repo_name, "open")
     
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Script to roll open issues over from overdue milestones to the next milestone.
+Usage: python scripts/rollover_milestones.py <github_token> [--close-empty] [--plan] [--concurrency=N]
+
+Every open milestone whose due date has passed has its open issues moved to
+the earliest open milestone that is not yet due. Issues are selected with the
+server-side milestone filter and updated concurrently; write concurrency
+adapts automatically unless fixed with --concurrency=N. With --close-empty,
+milestones left without open issues are closed.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+import github_api
+
+def get_open_milestones(token, repo_owner, repo_name):
+    """Get all open milestones, ordered by due date."""
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/milestones"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+    params = {
+        "state": "open",
+        "sort": "due_on",
+        "direction": "asc"
+    }
+
+    milestones = []
+    for page in github_api.iter_pages(url, headers=headers, params=params):
+        milestones.extend(page)
+    return milestones
+
+def get_milestone_issues(token, repo_owner, repo_name, milestone_number):
+    """Get the open issues of a milestone, filtered server-side."""
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+    params = {
+        "milestone": milestone_number,
+        "state": "open"
+    }
+
+    issues = []
+    for page in github_api.iter_pages(url, headers=headers, params=params):
+        # Filter out pull requests
+        issues.extend(issue for issue in page if "pull_request" not in issue)
+    return issues
+
+def assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, milestone_number):
+    """Assign an issue to a milestone."""
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues/{issue_number}"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+    data = {
+        "milestone": milestone_number
+    }
+
+    response = github_api.patch(url, headers=headers, json=data)
+
+    if response.status_code == 200:
+        return True
+    else:
+        print(f"❌ Failed to assign issue #{issue_number} to milestone #{milestone_number}")
+        print(f"Error: {response.text}")
+        return False
+
+def close_milestone_if_empty(token, repo_owner, repo_name, milestone):
+    """Close a milestone once it has no open issues or pull requests left."""
+    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/milestones/{milestone['number']}"
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {token}"
+    }
+
+    if not github_api.PLAN_MODE:
+        response = github_api.get(url, headers=headers)
+        if response.status_code != 200:
+            print(f"❌ Failed to get milestone '{milestone['title']}'")
+            print(f"Error: {response.text}")
+            return False
+        if response.json()["open_issues"]:
+            print(f"Milestone '{milestone['title']}' still has open items (pull requests?). Leaving it open.")
+            return False
+
+    response = github_api.patch(url, headers=headers, json={"state": "closed"})
+
+    if response.status_code == 200:
+        print(f"✅ Closed milestone '{milestone['title']}'")
+        return True
+    else:
+        print(f"❌ Failed to close milestone '{milestone['title']}'")
+        print(f"Error: {response.text}")
+        return False
+
+def parse_due_on(milestone):
+    return datetime.fromisoformat(milestone["due_on"].replace("Z", "+00:00"))
+
+def main():
+    github_api.configure_from_argv()
+    close_empty = "--close-empty" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--close-empty"]
+
+    if len(args) != 1:
+        print("Usage: python scripts/rollover_milestones.py <github_token> [--close-empty] [--plan] [--concurrency=N]")
+        sys.exit(1)
+
+    token = args[0]
+    repo_owner = "samsiso"
+    repo_name = "mallocra-activities"
+    now = datetime.now(timezone.utc)
+
+    try:
+        milestones = [m for m in get_open_milestones(token, repo_owner, repo_name) if m["due_on"]]
+    except RuntimeError as e:
+        print(f"❌ Failed to get milestones")
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    with github_api.phase("plan"):
+        overdue = [m for m in milestones if parse_due_on(m) < now]
+        upcoming = [m for m in milestones if parse_due_on(m) >= now]
+
+    if not overdue:
+        print("No overdue milestones. Nothing to roll over.")
+        return
+    if not upcoming:
+        print("No upcoming milestone to roll issues over to. Please create one first.")
+        sys.exit(1)
+
+    target = min(upcoming, key=parse_due_on)
+    print(f"Rolling over {len(overdue)} overdue milestones to '{target['title']}' (#{target['number']}, "
+          f"due {parse_due_on(target).strftime('%Y-%m-%d')})")
+
+    # Collect every move first so all updates run as one concurrent batch
+    moves = []
+    for milestone in overdue:
+        if not milestone["open_issues"]:
+            continue
+        try:
+            issues = get_milestone_issues(token, repo_owner, repo_name, milestone["number"])
+        except RuntimeError as e:
+            print(f"❌ Failed to get issues for milestone '{milestone['title']}'")
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"  - {milestone['title']} (due {parse_due_on(milestone).strftime('%Y-%m-%d')}): {len(issues)} open issues")
+        moves.extend(issue["number"] for issue in issues)
+
+    print(f"\nMoving {len(moves)} issues...")
+    results = github_api.run_concurrently(
+        lambda issue_number: assign_issue_to_milestone(token, repo_owner, repo_name, issue_number, target["number"]),
+        moves,
+    )
+    print(f"✅ Moved {sum(results)} of {len(moves)} issues to '{target['title']}' "
+          f"(write concurrency {github_api.concurrency_label()})")
+
+    if close_empty:
+        for milestone in overdue:
+            close_milestone_if_empty(token, repo_owner, repo_name, milestone)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Check the compiled rule matcher against a naive per-rule evaluation.
+
+Run from the repository root:
+    python -m unittest discover -s scripts/tests
+"""
+
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assignment_rules import compile_rules
+
+LABELS = ["bug", "enhancement", "landing-page", "High-Priority", "wontfix", "docs"]
+MILESTONES = ["Landing Page v1", "Activities Page v1", "MVP Release"]
+PREFIXES = ["[Landing Page]", "[landing", "[Activities Page]", "fix"]
+REGEXES = [r"map|navigation", r"(?i)MAP", r"^\[", r"(foo)\1", r"hero\b"]
+KEYWORDS = ["search", "hero", "he", "map", "page"]
+WORDS = ["hero", "search", "map", "Map", "navigation", "page", "foofoo", "footer", "fix", "heros"]
+
+
+def naive_matches(rule, issue):
+    """Evaluate one rule directly from its definition."""
+    title = issue.get("title") or ""
+    labels = {(label["name"] if isinstance(label, dict) else label).lower() for label in issue.get("labels", [])}
+    milestone = issue.get("milestone")
+    if isinstance(milestone, dict):
+        milestone = milestone.get("title")
+
+    if not all(label.lower() in labels for label in rule.get("labels", [])):
+        return False
+    if rule.get("any_labels") and not any(label.lower() in labels for label in rule["any_labels"]):
+        return False
+    if any(label.lower() in labels for label in rule.get("exclude_labels", [])):
+        return False
+    if rule.get("title_prefix") and not title.lower().startswith(rule["title_prefix"].lower()):
+        return False
+    if rule.get("title_regex") and not re.search(rule["title_regex"], title):
+        return False
+    if rule.get("keywords") and not any(keyword.lower() in title.lower() for keyword in rule["keywords"]):
+        return False
+    if "current_milestone" in rule:
+        allowed = rule["current_milestone"]
+        allowed = allowed if isinstance(allowed, list) else [allowed]
+        if milestone not in allowed:
+            return False
+    return True
+
+
+def random_rule(rng, index):
+    rule = {"milestone": f"M{index}"}
+    if rng.random() < 0.4:
+        rule["labels"] = rng.sample(LABELS, rng.randint(1, 2))
+    if rng.random() < 0.3:
+        rule["any_labels"] = rng.sample(LABELS, rng.randint(1, 3))
+    if rng.random() < 0.3:
+        rule["exclude_labels"] = rng.sample(LABELS, 1)
+    if rng.random() < 0.4:
+        rule["title_prefix"] = rng.choice(PREFIXES)
+    if rng.random() < 0.4:
+        rule["title_regex"] = rng.choice(REGEXES)
+    if rng.random() < 0.4:
+        rule["keywords"] = rng.sample(KEYWORDS, rng.randint(1, 3))
+    if rng.random() < 0.3:
+        rule["current_milestone"] = rng.choice([None, rng.choice(MILESTONES), [None, rng.choice(MILESTONES)]])
+    return rule
+
+
+def random_issue(rng):
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4)))
+    if rng.random() < 0.6:
+        title = f"{rng.choice(PREFIXES)} {title}"
+    labels = [label.lower() if rng.random() < 0.5 else label.upper() for label in rng.sample(LABELS, rng.randint(0, 3))]
+    milestone = rng.choice([None, None] + MILESTONES + ["Other"])
+    return {
+        "title": title,
+        "labels": [{"name": label} for label in labels] if rng.random() < 0.5 else labels,
+        "milestone": {"title": milestone} if milestone else None,
+    }
+
+
+class RuleMatcherTest(unittest.TestCase):
+
+    def test_matches_naive_evaluation(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            rules = [random_rule(rng, index) for index in range(rng.randint(1, 12))]
+            matcher = compile_rules(rules)
+            for _ in range(25):
+                issue = random_issue(rng)
+                expected = [rule for rule in rules if naive_matches(rule, issue)]
+                mask = matcher.match_mask(issue)
+                self.assertEqual([rule for bit, rule in enumerate(rules) if mask >> bit & 1], expected,
+                                 (rules, issue))
+                self.assertIs(matcher.match(issue), expected[0] if expected else None, (rules, issue))
+
+    def test_prefix_and_regex_must_both_hold(self):
+        matcher = compile_rules([{"milestone": "M", "title_prefix": "[Landing Page]", "title_regex": "hero"}])
+        self.assertIsNone(matcher.match({"title": "hero section"}))
+        self.assertIsNone(matcher.match({"title": "[Landing Page] footer"}))
+        self.assertIsNotNone(matcher.match({"title": "[Landing Page] hero section"}))
+
+    def test_regex_flags_and_backreferences(self):
+        matcher = compile_rules([
+            {"milestone": "A", "title_regex": r"(?i)map"},
+            {"milestone": "B", "title_regex": r"(foo)\1"},
+        ])
+        self.assertEqual(matcher.match({"title": "Interactive MAP view"})["milestone"], "A")
+        self.assertEqual(matcher.match({"title": "foofoo widget"})["milestone"], "B")
+        self.assertIsNone(matcher.match({"title": "foo bar"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Check IssueIndex lookups against a naive scan of every indexed title.
+
+Run from the repository root:
+    python -m unittest discover -s scripts/tests
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from issue_index import IssueIndex, jaccard, normalize_title
+
+TAG = "[Landing Page]"
+WORDS = ["add", "hero", "search", "bar", "fix", "footer", "map", "mobile", "layout", "loading",
+         "skeletons", "booking", "flow", "dark", "mode", "SEO", "meta", "tags"]
+TAGS = [TAG, "[landing page]", "[Activities Page]", ""]
+
+
+def random_title(rng):
+    words = rng.sample(WORDS, rng.randint(1, 6))
+    punctuation = rng.choice([" ", " - ", ", ", "_"])
+    return f"{rng.choice(TAGS)} {punctuation.join(words)}{rng.choice(['', '!', '?'])}".strip()
+
+
+def similar_title(rng, title):
+    """Return title with one word added or dropped, a likely near-duplicate."""
+    words = title.split()
+    if len(words) > 2 and rng.random() < 0.5:
+        del words[rng.randrange(1, len(words))]
+    else:
+        words.insert(rng.randint(1, len(words)), rng.choice(WORDS))
+    return " ".join(words)
+
+
+def naive_similarity(issues, title, threshold):
+    """Best similarity of title against every issue, or None below threshold."""
+    normalized = normalize_title(title, TAG)
+    if any(normalize_title(issue["title"], TAG) == normalized for issue in issues):
+        return 1.0
+    tokens = frozenset(normalized.split())
+    if not tokens:
+        return None
+    best = max((jaccard(tokens, frozenset(normalize_title(issue["title"], TAG).split())) for issue in issues),
+               default=0.0)
+    return best if best >= threshold else None
+
+
+class IssueIndexTest(unittest.TestCase):
+
+    def check_against_naive_scan(self, threshold):
+        rng = random.Random(threshold)
+        for _ in range(100):
+            issues = [{"number": number, "title": random_title(rng)} for number in range(rng.randint(0, 40))]
+            index = IssueIndex(issues, threshold=threshold, strip_tag=TAG)
+            for _ in range(20):
+                title = random_title(rng)
+                if issues and rng.random() < 0.5:
+                    title = similar_title(rng, rng.choice(issues)["title"])
+                expected = naive_similarity(issues, title, threshold)
+                match = index.find(title)
+                if expected is None:
+                    self.assertIsNone(match, (title, issues))
+                    continue
+                self.assertIsNotNone(match, (title, issues))
+                issue, similarity = match
+                self.assertAlmostEqual(similarity, expected, msg=(title, issues))
+                if similarity < 1.0:
+                    self.assertAlmostEqual(jaccard(frozenset(normalize_title(title, TAG).split()),
+                                                   frozenset(normalize_title(issue["title"], TAG).split())),
+                                           similarity)
+
+    def test_find_matches_naive_scan(self):
+        self.check_against_naive_scan(0.8)
+
+    def test_find_matches_naive_scan_low_threshold(self):
+        self.check_against_naive_scan(0.5)
+
+    def test_find_or_add_matches_naive_scan(self):
+        rng = random.Random(1)
+        index = IssueIndex(strip_tag=TAG)
+        added = []
+        for _ in range(500):
+            issue = {"title": random_title(rng)}
+            expected = naive_similarity(added, issue["title"], index.threshold)
+            match = index.find_or_add(issue)
+            self.assertEqual(match is None, expected is None, issue)
+            if match is None:
+                added.append(issue)
+            else:
+                self.assertAlmostEqual(match[1], expected)
+
+    def test_only_the_strip_tag_is_dropped(self):
+        index = IssueIndex([{"number": 1, "title": "[Activities Page] Add loading skeletons"}], strip_tag=TAG)
+        self.assertIsNone(index.find("[Landing Page] Add loading skeletons"))
+        index = IssueIndex([{"number": 1, "title": "Add loading skeletons!"}], strip_tag=TAG)
+        self.assertEqual(index.find("[Landing Page] add loading skeletons")[1], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()